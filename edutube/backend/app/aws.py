@@ -0,0 +1,78 @@
+# app/aws.py
+"""Shared boto3 clients and the bounded executor that runs blocking AWS calls off the event loop."""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from app.config import settings
+
+T = TypeVar("T")
+
+# boto3 clients are thread-safe once created; creation itself is not, hence the lock.
+_clients: dict[tuple[str, str, int | None], Any] = {}
+_clients_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+
+
+def aws_kwargs(region: str | None = None) -> dict:
+    """Shared AWS client kwargs from settings."""
+    kwargs = {"region_name": region or settings.aws_region}
+    if settings.aws_access_key_id and settings.aws_secret_access_key:
+        kwargs["aws_access_key_id"] = settings.aws_access_key_id
+        kwargs["aws_secret_access_key"] = settings.aws_secret_access_key
+    return kwargs
+
+
+def get_client(service: str, region: str | None = None, *, max_attempts: int | None = None) -> Any:
+    """
+    Return the process-wide boto3 client for service/region, creating it on first use.
+    max_attempts overrides botocore's retry count (1 = no automatic retries).
+    """
+    key = (service, region or settings.aws_region, max_attempts)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            import boto3
+            from botocore.config import Config
+
+            # Pool size matches the executor so no worker waits on a connection.
+            config = Config(max_pool_connections=settings.aws_max_workers)
+            if max_attempts is not None:
+                config = config.merge(Config(retries={"mode": "standard", "max_attempts": max_attempts}))
+            client = boto3.client(service, config=config, **aws_kwargs(key[1]))
+            _clients[key] = client
+    return client
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor  # noqa: PLW0603
+    if _executor is None:
+        with _clients_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.aws_max_workers,
+                    thread_name_prefix="aws",
+                )
+    return _executor
+
+
+async def run_blocking(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking (boto3) call on the bounded AWS executor and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), functools.partial(fn, *args, **kwargs))
+
+
+def shutdown_aws() -> None:
+    """Stop the AWS executor and drop cached clients (called at app shutdown)."""
+    global _executor  # noqa: PLW0603
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+    with _clients_lock:
+        _clients.clear()
@@ -20,9 +20,26 @@ class Settings(BaseSettings):
     mongodb_url: str = "mongodb://localhost:27017"
     # Must match case of existing DB; MongoDB rejects e.g. "edutube" if "EduTube" exists
     mongodb_db_name: str = "EduTube"
+    # GET /journeys/public: in-process cache of serialized pages, and the Cache-Control max-age sent to clients/CDN.
+    # Writes invalidate this process's cache immediately; other API processes catch up within the TTL.
+    catalog_cache_ttl_seconds: int = 30
+    catalog_cache_max_entries: int = 256
+    catalog_http_max_age_seconds: int = 30
 
     # Optional: YouTube (YT_KEY)
     yt_key: str = ""
+    # Playlist import stops after this many videos
+    playlist_max_videos: int = 500
+    # YouTube metadata cache (youtube_cache collection): fresh for TTL, then revalidated with ETags
+    youtube_cache_ttl_seconds: int = 3600
+    youtube_cache_stale_while_revalidate: bool = True
+    youtube_cache_max_stale_seconds: int = 7 * 24 * 3600  # entries unused this long are purged
+    # Shared outbound HTTP client (app.http_client)
+    http_timeout_seconds: float = 10.0
+    http_connect_timeout_seconds: float = 5.0
+    http_max_connections: int = 50
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry_seconds: float = 60.0
     # AWS Bedrock (Nova Lite)
     aws_region: str = "ap-south-1"
     aws_access_key_id: str = ""
@@ -30,14 +47,69 @@ class Settings(BaseSettings):
     nova_lite_model_id: str = "apac.amazon.nova-lite-v1:0"
     # Optional: set to full inference profile ARN if profile ID returns "invalid model identifier"
     bedrock_inference_profile_arn: str = ""
+    # Threads for blocking boto3 calls (Bedrock, KB retrieve); also the client connection pool size
+    aws_max_workers: int = 16
 
     # Knowledge base: S3 bucket for transcript uploads (sync later)
     s3_bucket: str = ""
     s3_transcript_prefix: str = "edutube/transcripts"
     s3_region: str | None = None  # defaults to aws_region if unset
+    s3_multipart_threshold_mb: int = 8
+    # Transcript storage: "s3", "local" or "none" (default: s3 when S3_BUCKET is set)
+    transcript_storage: str = ""
+    transcript_local_dir: str = "data/transcripts"
+    transcript_compression: str = "none"  # none | gzip | zstd (keep none for Bedrock KB sync)
+
+    # Transcript jobs: "background" (in-process BackgroundTasks) or "queue" (durable; run `python worker.py`)
+    transcript_jobs: str = "background"
+    transcript_worker_concurrency: int = 4
+    transcript_worker_poll_seconds: float = 2.0
+    transcript_job_max_attempts: int = 3
+    transcript_job_lease_seconds: int = 300
+    transcript_job_backoff_seconds: float = 30.0
+
+    # Timestamped transcript chunks (transcript_chunks collection)
+    transcript_chunk_seconds: float = 60.0
+    transcript_chunk_overlap_seconds: float = 15.0
+
+    # Chapter-scoped chat: transcript window around the playback position, capped to a token budget
+    chapter_context_before_seconds: float = 90.0
+    chapter_context_after_seconds: float = 30.0
+    chapter_context_max_tokens: int = 1500
+
+    # Playlist transcripts: parallel videos per import, and a per-process cap on YouTube transcript requests
+    playlist_transcript_concurrency: int = 4
+    youtube_transcript_rate_per_second: float = 2.0
+    youtube_transcript_burst: int = 4
 
     # RAG: Bedrock Knowledge Base ID (for Knowledge-mode chat; same Nova Lite model)
     knowledge_base_id: str = ""
+    kb_number_of_results: int = 10
+    # Retrieval backend for Knowledge-mode chat: "bedrock" (KNOWLEDGE_BASE_ID) or "local" (in-process index)
+    retrieval_backend: str = "bedrock"
+    local_index_dir: str = "data/vector_index"
+    local_index_dim: int = 4096
+    local_index_chunk_words: int = 200
+    local_index_chunk_overlap: int = 40
+    # Retrieval cache (per process) and prompt packing for KB excerpts
+    kb_cache_ttl_seconds: int = 600
+    kb_cache_max_entries: int = 500
+    kb_near_duplicate_threshold: float = 0.8  # word-trigram Jaccard similarity
+    kb_context_max_tokens: int = 2000
+
+    # Admission control for Bedrock converse calls (excess is shed with 429 + Retry-After)
+    chat_max_concurrency: int = 8
+    chat_max_queue: int = 32
+    chat_queue_timeout_seconds: float = 10.0
+    # Retries for throttled Bedrock calls (full-jitter exponential backoff)
+    chat_max_retries: int = 3
+    chat_retry_base_delay_seconds: float = 0.25
+    chat_retry_max_delay_seconds: float = 4.0
+
+    # Chatbot answer cache: "memory" (per process), "mongo" (shared) or "off"
+    chat_cache_backend: str = "memory"
+    chat_cache_ttl_seconds: int = 3600
+    chat_cache_max_entries: int = 1000
 
     class Config:
         env_file = ".env"
@@ -4,7 +4,7 @@
 from typing import Any
 
 from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo import ASCENDING
+from pymongo import ASCENDING, DESCENDING
 
 from app.config import settings
 
@@ -31,11 +31,35 @@ async def connect_mongodb() -> None:
     await db.users.create_index("email", unique=True)
     await db.users.create_index("username")
     await db.journeys.create_index("user_id")
-    await db.journeys.create_index([("is_public", ASCENDING)])
+    await db.journeys.create_index([("is_public", ASCENDING), ("_id", DESCENDING)])
+    # Materialized public catalog: keyset pages by _id (default index) or fork count; owner renames
+    await db.public_catalog.create_index([("fork_count", DESCENDING), ("_id", DESCENDING)])
+    await db.public_catalog.create_index("user_id")
     await db.chapters.create_index("journey_id")
     await db.chapters.create_index([("journey_id", ASCENDING), ("chapter_no", ASCENDING)])
+    # Covers the dashboard $group (chapter totals, legacy is_completed fallback) and legacy flag seeding
+    await db.chapters.create_index([("journey_id", ASCENDING), ("is_completed", ASCENDING)])
+    # Per-learner progress bitsets; journey_id alone for clearing a deleted chapter's bit
+    await db.progress.create_index([("user_id", ASCENDING), ("journey_id", ASCENDING)], unique=True)
+    await db.progress.create_index("journey_id")
     await db.notes.create_index("chapter_id")
     await db.notes.create_index("journey_id")
+    # Transcript job queue: claim scans due jobs by state/run_at; progress groups by journey
+    await db.transcript_jobs.create_index([("state", ASCENDING), ("run_at", ASCENDING)])
+    await db.transcript_jobs.create_index([("state", ASCENDING), ("lease_until", ASCENDING)])
+    await db.transcript_jobs.create_index("journey_id")
+    # Async playlist imports, looked up by journey (latest first)
+    await db.playlist_imports.create_index([("journey_id", ASCENDING), ("created_at", DESCENDING)])
+    # Transcript store: one record per YouTube video
+    await db.transcripts.create_index("video_id", unique=True)
+    await db.transcript_chunks.create_index([("video_id", ASCENDING), ("start", ASCENDING)])
+    # YouTube metadata cache; expires_at (refreshed on every fetch/304) drives TTL removal
+    await db.youtube_cache.create_index("key", unique=True)
+    await db.youtube_cache.create_index("expires_at", expireAfterSeconds=0)
+    # Chatbot answer cache (used when CHAT_CACHE_BACKEND=mongo); expires_at drives TTL removal
+    await db.chat_cache.create_index("key", unique=True)
+    await db.chat_cache.create_index("expires_at", expireAfterSeconds=0)
+    await db.chat_cache.create_index("last_used")
 
 
 async def close_mongodb() -> None:
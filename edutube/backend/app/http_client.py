@@ -0,0 +1,52 @@
+# app/http_client.py
+"""Application-lifetime pooled HTTP client (keep-alive, HTTP/2) for outbound API calls such as YouTube."""
+
+import logging
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Global client (set at startup in open_http_client)
+client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client. Use this instead of importing client directly,
+    so callers always see the client opened during lifespan startup."""
+    if client is None:
+        raise RuntimeError("HTTP client not initialized; open_http_client() has not run.")
+    return client
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("h2 not installed; outbound HTTP uses HTTP/1.1 (pip install 'httpx[http2]')")
+        return False
+    return True
+
+
+async def open_http_client() -> None:
+    """Create the shared client with pool limits and timeouts from settings."""
+    global client  # noqa: PLW0603
+    client = httpx.AsyncClient(
+        http2=_http2_available(),
+        timeout=httpx.Timeout(settings.http_timeout_seconds, connect=settings.http_connect_timeout_seconds),
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry_seconds,
+        ),
+    )
+
+
+async def close_http_client() -> None:
+    """Close the shared client and its pooled connections."""
+    global client  # noqa: PLW0603
+    if client:
+        await client.aclose()
+        client = None
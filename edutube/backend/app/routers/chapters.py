@@ -4,16 +4,34 @@
 from fastapi import APIRouter, BackgroundTasks, HTTPException
 
 from app.auth import CurrentUser
-from app.schemas import ChapterCreate, ChapterUpdate, ChapterCompleteUpdate, ChapterCreateResponse
+from app.schemas import (
+    ChapterCreate,
+    ChapterUpdate,
+    ChapterCompleteUpdate,
+    ChapterCreateResponse,
+    ChapterBatchCreate,
+    ChapterBatchCreateResponse,
+    ChapterReorder,
+    ChapterProgressUpdate,
+)
 from app.services.chapter_service import (
     create_chapter,
+    create_chapters,
+    reorder_chapters,
     get_chapters_by_journey_id,
     get_chapter_by_id,
+    get_chapter_positions,
     update_chapter,
-    update_chapter_complete,
     delete_chapter,
 )
-from app.services.knowledge_pipeline import schedule_transcript_processing
+from app.services.journey_service import get_journey_by_id
+from app.services.progress_service import (
+    apply_completion,
+    ensure_positions,
+    get_completed_count,
+    set_completed,
+)
+from app.services.transcript_jobs import schedule_transcripts
 
 router = APIRouter(prefix="/journeys", tags=["chapters"])
 
@@ -34,18 +52,43 @@ async def create_chapter_route(
         chapter_no=body.chapter_no,
     )
     # Knowledge base: extract transcript and upload to S3 in background (non-blocking)
-    background_tasks.add_task(
-        schedule_transcript_processing,
-        body.video_link,
+    await schedule_transcripts(background_tasks, journey_id, [(body.video_link, cid)])
+    return ChapterCreateResponse(id=cid)
+
+
+@router.post("/{journey_id}/chapters:batch", response_model=ChapterBatchCreateResponse)
+async def create_chapters_batch_route(
+    journey_id: str,
+    body: ChapterBatchCreate,
+    user: CurrentUser,
+    background_tasks: BackgroundTasks,
+):
+    """Create many chapters with one insert_many; ids are returned in request order."""
+    chapters = [ch.model_dump() for ch in body.chapters]
+    ids = await create_chapters(journey_id, chapters)
+    await schedule_transcripts(
+        background_tasks,
         journey_id,
-        chapter_id=cid,
+        [(ch["video_link"], cid) for ch, cid in zip(chapters, ids)],
     )
-    return ChapterCreateResponse(id=cid)
+    return ChapterBatchCreateResponse(ids=ids)
+
+
+@router.put("/{journey_id}/chapters/order")
+async def reorder_chapters_route(journey_id: str, body: ChapterReorder, user: CurrentUser):
+    """Rewrite chapter_no for all of the journey's chapters (1..n in the given order) in one bulk_write."""
+    if len(set(body.chapter_ids)) != len(body.chapter_ids):
+        raise HTTPException(status_code=400, detail="Duplicate chapter ids")
+    matched = await reorder_chapters(journey_id, body.chapter_ids)
+    if matched is None:
+        raise HTTPException(status_code=400, detail="chapter_ids must list every chapter of the journey exactly once")
+    return {"message": "Chapters reordered successfully", "matched": matched}
 
 
 @router.get("/{journey_id}/chapters")
 async def list_chapters(journey_id: str, user: CurrentUser):
-    return await get_chapters_by_journey_id(journey_id)
+    chapters = await get_chapters_by_journey_id(journey_id)
+    return await apply_completion(user["id"], journey_id, chapters)
 
 
 @router.get("/chapters/{chapter_id}")
@@ -53,6 +96,7 @@ async def get_chapter(chapter_id: str, user: CurrentUser):
     ch = await get_chapter_by_id(chapter_id)
     if not ch:
         raise HTTPException(status_code=404, detail="Chapter not found")
+    await apply_completion(user["id"], ch.get("journey_id") or "", [ch])
     return ch
 
 
@@ -77,12 +121,41 @@ async def update_chapter_complete_route(
     body: ChapterCompleteUpdate,
     user: CurrentUser,
 ):
-    updated = await update_chapter_complete(chapter_id, body.is_completed)
-    if not updated:
+    """Mark one chapter complete / incomplete for the current user (per-learner progress)."""
+    ch = await get_chapter_by_id(chapter_id)
+    if not ch:
         raise HTTPException(status_code=404, detail="Chapter not found")
+    journey_id = ch.get("journey_id") or ""
+    if not await get_journey_by_id(journey_id):
+        raise HTTPException(status_code=404, detail="Journey not found")
+    await ensure_positions(journey_id, [ch])
+    if not await set_completed(user["id"], journey_id, [ch["position"]], body.is_completed):
+        raise HTTPException(status_code=404, detail="Chapter not found")  # deleted meanwhile
     return {"message": "Chapter updated successfully"}
 
 
+@router.put("/{journey_id}/progress")
+async def update_progress_route(journey_id: str, body: ChapterProgressUpdate, user: CurrentUser):
+    """Mark many chapters of a journey complete / incomplete for the current user in one update."""
+    if not await get_journey_by_id(journey_id):
+        raise HTTPException(status_code=404, detail="Journey not found")
+    positions = await get_chapter_positions(journey_id, body.chapter_ids)
+    if positions is None:
+        raise HTTPException(status_code=404, detail="Chapters not found in journey")
+    updated = await set_completed(user["id"], journey_id, positions, body.is_completed)
+    return {"message": "Progress updated successfully", "updated": updated}
+
+
+@router.get("/{journey_id}/progress")
+async def get_progress_route(journey_id: str, user: CurrentUser):
+    """The current user's completed chapter count for a journey (one progress document read)."""
+    journey = await get_journey_by_id(journey_id)
+    if not journey:
+        raise HTTPException(status_code=404, detail="Journey not found")
+    completed = await get_completed_count(user["id"], journey_id, owner_id=journey.get("user_id") or "")
+    return {"journey_id": journey_id, "completed": completed}
+
+
 @router.delete("/chapters/{chapter_id}")
 async def delete_chapter_route(chapter_id: str, user: CurrentUser):
     deleted = await delete_chapter(chapter_id)
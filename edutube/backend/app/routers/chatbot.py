@@ -1,63 +1,175 @@
 # app/routers/chatbot.py
 """AWS Nova Lite–powered chatbot (normal and Knowledge-base RAG). Same model, different config."""
 
+import json
+from collections.abc import AsyncIterator, Iterator
+
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 
+from app.aws import get_client, run_blocking
 from app.config import settings
 from app.schemas import ChatRequest, ChatResponse, HealthResponse
+from app.services.admission import AdmissionController, Overloaded, is_throttling, with_backoff
+from app.services.chapter_context import build_chapter_context
+from app.services.chat_cache import (
+    cache_key,
+    cache_stats,
+    get_cached_answer,
+    record_bypass,
+    store_answer,
+)
+from app.services.kb_retrieval import (
+    knowledge_enabled,
+    retrieval_flight_stats,
+    retrieval_stats,
+    retrieve_context,
+)
+from app.services.single_flight import SingleFlight
 
 router = APIRouter(prefix="/chatbot", tags=["chatbot"])
 
-
-def _aws_kwargs():
-    """Shared AWS client kwargs from settings."""
-    kwargs = {"region_name": settings.aws_region}
-    if settings.aws_access_key_id and settings.aws_secret_access_key:
-        kwargs["aws_access_key_id"] = settings.aws_access_key_id
-        kwargs["aws_secret_access_key"] = settings.aws_secret_access_key
-    return kwargs
+# Coalesces identical concurrent /chat requests (same key as the answer cache)
+_chat_flight = SingleFlight("chat")
+# Bounds concurrent Bedrock converse calls; excess waits briefly, then is shed with 429
+_admission = AdmissionController(
+    "bedrock",
+    max_concurrent=settings.chat_max_concurrency,
+    max_queue=settings.chat_max_queue,
+    queue_timeout=settings.chat_queue_timeout_seconds,
+)
+_retry_stats: dict = {"retries": 0}
+# Chapter chats whose playback positions fall in the same bucket share cached answers
+_TIMESTAMP_BUCKET_SECONDS = 15
 
 
 def _get_bedrock_client():
-    """Bedrock Runtime client for Converse (Nova Lite)."""
-    import boto3
-    return boto3.client("bedrock-runtime", **_aws_kwargs())
+    """Bedrock Runtime client for Converse (Nova Lite); shared per process.
+    botocore retries are off: throttling is retried here with jittered backoff instead."""
+    return get_client("bedrock-runtime", max_attempts=1)
+
 
+async def _retrieve_from_knowledge_base(query: str, journey_id: str | None = None) -> str:
+    """KB excerpts for query (cached, deduplicated, token-capped); empty string if unavailable."""
+    return await retrieve_context(query, journey_id=journey_id)
 
-def _get_kb_client():
-    """Bedrock Agent Runtime client for Knowledge Base retrieve."""
-    import boto3
-    return boto3.client("bedrock-agent-runtime", **_aws_kwargs())
 
+DEFAULT_SYSTEM_PROMPT = """You are a helpful AI assistant for EduTube, a platform for organizing and tracking learning journeys. Provide concise, helpful responses. If the question is about "Agent SDK" or technical topics, explain them simply."""
+KNOWLEDGE_SYSTEM_PROMPT = """You are a helpful EduTube assistant. Answer using ONLY the following knowledge-base excerpts when they are relevant. If the excerpts do not contain the answer, say so and keep the response brief."""
+CHAPTER_SYSTEM_PROMPT = """You are a helpful EduTube assistant. The learner is watching a video chapter; a transcript excerpt from it is provided. Ground your answer in the excerpt when it is relevant, and say so briefly when the video does not cover the question."""
 
-def _retrieve_from_knowledge_base(query: str) -> str:
+
+async def _build_prompt(body: ChatRequest) -> tuple[str, str, bool]:
     """
-    Call Bedrock Knowledge Base retrieve with kbid; return concatenated chunk text.
-    Returns empty string if KB not configured or retrieve fails.
+    Return (system_prompt, user_content, cacheable) for the request. A chapter_id grounds the prompt
+    on that chapter's transcript (built server-side); otherwise knowledge mode retrieves from the KB.
+    A chapter request whose transcript is not indexed yet falls back ungrounded and is not cacheable,
+    so the generic answer is not served under the chapter's key once the transcript exists.
     """
-    kbid = (settings.knowledge_base_id or "").strip()
-    if not kbid:
-        return ""
-    try:
-        client = _get_kb_client()
-        resp = client.retrieve(
-            knowledgeBaseId=kbid,
-            retrievalQuery={"text": query, "type": "TEXT"},
-            retrievalConfiguration={
-                "vectorSearchConfiguration": {"numberOfResults": 10}
-            },
+    if body.chapter_id:
+        chapter = await build_chapter_context(body.chapter_id, body.message, body.timestamp)
+        if chapter:
+            title, excerpt = chapter
+            user_content = f"""Chapter: {title}\nTranscript excerpt:\n{excerpt}\n\nUser question: {body.message}"""
+            return CHAPTER_SYSTEM_PROMPT, user_content, True
+    system_prompt = DEFAULT_SYSTEM_PROMPT
+    user_content = f"Current context: {body.context or 'General query'}\n\nUser question: {body.message}"
+    if body.use_knowledge and knowledge_enabled():
+        # Knowledge mode: retrieve from KB, then send context + question to Nova Lite
+        kb_context = await _retrieve_from_knowledge_base(body.message, body.journey_id)
+        if kb_context:
+            system_prompt = KNOWLEDGE_SYSTEM_PROMPT
+            user_content = f"""Knowledge base excerpts:\n{kb_context}\n\nUser question: {body.message}"""
+    return system_prompt, user_content, not body.chapter_id
+
+
+def _converse_kwargs(system_prompt: str, user_content: str) -> dict:
+    """Shared request kwargs for converse / converse_stream."""
+    return {
+        "modelId": settings.bedrock_model_id,
+        "messages": [{"role": "user", "content": [{"text": user_content}]}],
+        "system": [{"text": system_prompt}],
+    }
+
+
+def _to_http_error(e: Exception) -> HTTPException:
+    """Map a Bedrock / boto error to the HTTPException the chat endpoints raise."""
+    err_msg = str(e)
+    if isinstance(e, Overloaded):
+        return HTTPException(
+            status_code=429, detail=err_msg, headers={"Retry-After": str(e.retry_after)}
         )
-        results = resp.get("retrievalResults") or []
-        parts = []
-        for item in results:
-            content = item.get("content") or {}
-            # Text chunks: content may have 'text' or nested structure
-            text = content.get("text", "").strip() if isinstance(content.get("text"), str) else ""
-            if text:
-                parts.append(text)
-        return "\n\n".join(parts) if parts else ""
-    except Exception:
-        return ""
+    if is_throttling(e):
+        return HTTPException(
+            status_code=429,
+            detail="Chat service is rate limited; please retry shortly.",
+            headers={"Retry-After": str(_admission.retry_after())},
+        )
+    if "ValidationException" in type(e).__name__ or "Validation" in err_msg:
+        return HTTPException(status_code=400, detail=err_msg)
+    if "AccessDenied" in err_msg or "AccessDeniedException" in type(e).__name__:
+        return HTTPException(
+            status_code=503,
+            detail="Chatbot not configured. Set AWS credentials and enable Nova Lite in Bedrock.",
+        )
+    return HTTPException(status_code=500, detail=err_msg or "Failed to process request")
+
+
+def _request_cache_key(body: ChatRequest) -> str:
+    return cache_key(
+        body.message,
+        body.context,
+        body.use_knowledge,
+        settings.bedrock_model_id,
+        scope=_request_scope(body),
+    )
+
+
+def _request_scope(body: ChatRequest) -> str | None:
+    """Part of the cache key that captures server-side context: journey, chapter and playback bucket."""
+    if not (body.journey_id or body.chapter_id):
+        return None
+    bucket = ""
+    if body.chapter_id and body.timestamp is not None:
+        # Nearby positions share a context window closely enough to share answers
+        bucket = str(int(body.timestamp // _TIMESTAMP_BUCKET_SECONDS))
+    return "|".join([body.journey_id or "", body.chapter_id or "", bucket])
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _with_retry(fn):
+    return await with_backoff(
+        fn,
+        max_retries=settings.chat_max_retries,
+        base_delay=settings.chat_retry_base_delay_seconds,
+        max_delay=settings.chat_retry_max_delay_seconds,
+        stats=_retry_stats,
+    )
+
+
+async def _generate_answer(body: ChatRequest, key: str) -> str:
+    """Build the prompt, call converse, cache and return the answer text ("" if none)."""
+    client = await run_blocking(_get_bedrock_client)
+    system_prompt, user_content, cacheable = await _build_prompt(body)
+    kwargs = _converse_kwargs(system_prompt, user_content)
+    async with _admission.slot():
+        response = await _with_retry(lambda: run_blocking(client.converse, **kwargs))
+    output = response.get("output", {})
+    message = output.get("message", {})
+    content_blocks = message.get("content", [])
+    text_parts = [
+        block.get("text", "")
+        for block in content_blocks
+        if isinstance(block.get("text"), str)
+    ]
+    text = "".join(text_parts).strip()
+    if text and cacheable:
+        await store_answer(key, text)
+    return text
 
 
 @router.post("/chat", response_model=ChatResponse)
@@ -65,51 +177,109 @@ async def chat(body: ChatRequest):
     """Normal chat or Knowledge-base chat; same Nova Lite model, different config."""
     if not body.message:
         raise HTTPException(status_code=400, detail="Message is required")
+    key = _request_cache_key(body)
+    if body.no_cache:
+        record_bypass()
+    elif (cached := await get_cached_answer(key)) is not None:
+        return ChatResponse(response=cached, success=True, fallback=False, cached=True)
     try:
-        client = _get_bedrock_client()
-        system_prompt = """You are a helpful AI assistant for EduTube, a platform for organizing and tracking learning journeys. Provide concise, helpful responses. If the question is about "Agent SDK" or technical topics, explain them simply."""
-        user_content = f"Current context: {body.context or 'General query'}\n\nUser question: {body.message}"
-
-        if body.use_knowledge and (settings.knowledge_base_id or "").strip():
-            # Knowledge mode: retrieve from KB, then send context + question to Nova Lite
-            kb_context = _retrieve_from_knowledge_base(body.message)
-            if kb_context:
-                system_prompt = """You are a helpful EduTube assistant. Answer using ONLY the following knowledge-base excerpts when they are relevant. If the excerpts do not contain the answer, say so and keep the response brief."""
-                user_content = f"""Knowledge base excerpts:\n{kb_context}\n\nUser question: {body.message}"""
-            else:
-                user_content = f"Current context: {body.context or 'General query'}\n\nUser question: {body.message}"
-
-        response = client.converse(
-            modelId=settings.bedrock_model_id,
-            messages=[{"role": "user", "content": [{"text": user_content}]}],
-            system=[{"text": system_prompt}],
-        )
-        output = response.get("output", {})
-        message = output.get("message", {})
-        content_blocks = message.get("content", [])
-        text_parts = [
-            block.get("text", "")
-            for block in content_blocks
-            if isinstance(block.get("text"), str)
-        ]
-        text = "".join(text_parts).strip() or "No response generated."
-        return ChatResponse(response=text, success=True, fallback=False)
+        # Identical concurrent requests share one retrieval + converse call
+        text = await _chat_flight.do(key, lambda: _generate_answer(body, key))
+    except Exception as e:
+        raise _to_http_error(e)
+    return ChatResponse(response=text or "No response generated.", success=True, fallback=False)
+
+
+def _raise_stream_exception(event: dict) -> None:
+    """Stream-level errors arrive as events (e.g. throttlingException); raise them as ClientError."""
+    from botocore.exceptions import ClientError
+
+    for name, val in event.items():
+        if name.endswith("Exception"):
+            code = name[0].upper() + name[1:]
+            message = (val or {}).get("message", "")
+            raise ClientError({"Error": {"Code": code, "Message": message}}, "ConverseStream")
+
+
+async def _stream_chat_events(body: ChatRequest) -> AsyncIterator[str]:
+    """
+    SSE events: one `token` per text delta, then `done` (or `error`).
+    Each blocking read of the Bedrock event stream runs on the AWS executor.
+    A cache hit is replayed as a single token; a completed stream is stored in the cache.
+    """
+    key = _request_cache_key(body)
+    if body.no_cache:
+        record_bypass()
+    elif (cached := await get_cached_answer(key)) is not None:
+        yield _sse("token", {"text": cached})
+        yield _sse("done", {"stopReason": "end_turn", "usage": {}, "cached": True})
+        return
+    parts: list[str] = []
+    try:
+        client = await run_blocking(_get_bedrock_client)
+        system_prompt, user_content, cacheable = await _build_prompt(body)
+        kwargs = _converse_kwargs(system_prompt, user_content)
+        # The slot is held for the whole stream: the Bedrock connection stays busy until it ends
+        async with _admission.slot():
+            response = await _with_retry(lambda: run_blocking(client.converse_stream, **kwargs))
+            stop_reason = None
+            usage: dict = {}
+            events: Iterator[dict] = iter(response.get("stream") or [])
+            while (event := await run_blocking(next, events, None)) is not None:
+                if "contentBlockDelta" in event:
+                    text = event["contentBlockDelta"].get("delta", {}).get("text")
+                    if text:
+                        parts.append(text)
+                        yield _sse("token", {"text": text})
+                elif "messageStop" in event:
+                    stop_reason = event["messageStop"].get("stopReason")
+                elif "metadata" in event:
+                    usage = event["metadata"].get("usage") or {}
+                else:
+                    _raise_stream_exception(event)
+        answer = "".join(parts).strip()
+        if answer and cacheable and stop_reason in ("end_turn", "stop_sequence"):
+            await store_answer(key, answer)
+        yield _sse("done", {"stopReason": stop_reason, "usage": usage, "cached": False})
     except Exception as e:
-        err_msg = str(e)
-        if "ValidationException" in type(e).__name__ or "Validation" in err_msg:
-            raise HTTPException(status_code=400, detail=err_msg)
-        if "AccessDenied" in err_msg or "AccessDeniedException" in type(e).__name__:
-            raise HTTPException(
-                status_code=503,
-                detail="Chatbot not configured. Set AWS credentials and enable Nova Lite in Bedrock.",
-            )
-        raise HTTPException(status_code=500, detail=err_msg or "Failed to process request")
+        err = _to_http_error(e)
+        data = {"status": err.status_code, "detail": err.detail}
+        if err.headers and "Retry-After" in err.headers:
+            data["retryAfter"] = int(err.headers["Retry-After"])
+        yield _sse("error", data)
+
+
+@router.post("/chat/stream")
+async def chat_stream(body: ChatRequest):
+    """Streaming variant of /chat: Server-Sent Events fed by Bedrock converse_stream."""
+    if not body.message:
+        raise HTTPException(status_code=400, detail="Message is required")
+    if _admission.saturated():
+        # Fail fast with a real 429 while we still can set status and headers
+        busy = Overloaded("Chat service is busy; please retry shortly.", _admission.retry_after())
+        raise _to_http_error(busy)
+    return StreamingResponse(
+        _stream_chat_events(body),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/stats")
+async def stats():
+    """Chatbot runtime counters (answer cache, KB retrieval cache, request coalescing, admission)."""
+    return {
+        "admission": {**_admission.stats(), **_retry_stats},
+        "cache": cache_stats(),
+        "retrieval": retrieval_stats(),
+        "coalescing": {"chat": _chat_flight.stats(), "retrieval": retrieval_flight_stats()},
+    }
 
 
 @router.get("/health", response_model=HealthResponse)
 async def health():
     try:
-        _get_bedrock_client()
+        await run_blocking(_get_bedrock_client)
         nova_configured = True
     except Exception:
         nova_configured = False
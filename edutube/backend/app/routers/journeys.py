@@ -1,38 +1,78 @@
 # app/routers/journeys.py
 """Journey CRUD, fork, playlist import, and public list."""
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException, status
+import asyncio
+from typing import Literal
+
+from fastapi import APIRouter, BackgroundTasks, Header, HTTPException, Query, Response, status
 
 from app.auth import CurrentUser
+from app.config import settings
 from app.schemas import (
     JourneyCreate,
     JourneyUpdate,
     JourneyCreateResponse,
     PlaylistCreate,
+    PlaylistCreateResponse,
+    PlaylistImportResponse,
 )
 from app.services.journey_service import (
     create_journey,
     get_all_journeys,
+    get_journeys_progress,
     get_journey_by_id,
+    get_journey_full,
     update_journey,
     delete_journey,
     fork_journey,
-    get_all_public_journeys,
+    CHAPTER_FIELDS,
+    NOTE_FIELDS,
+)
+from app.services.catalog_service import get_catalog_page_bytes
+from app.services.playlist_import import (
+    get_import_status,
+    insert_playlist_pages,
+    run_playlist_import,
+    start_playlist_import,
+)
+from app.services.playlist_service import get_playlist_details, iter_playlist_video_pages
+from app.services.transcript_jobs import (
+    get_journey_transcript_progress,
+    schedule_transcripts,
 )
-from app.services.chapter_service import create_chapter
-from app.services.playlist_service import get_playlist_details, get_playlist_videos
-from app.services.knowledge_pipeline import schedule_playlist_transcripts
 
 router = APIRouter(tags=["journeys"])
 
 
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
 @router.get("/journeys/public")
-async def list_public_journeys():
-    """List public journeys with username."""
-    journeys = await get_all_public_journeys()
-    if not journeys:
-        raise HTTPException(status_code=404, detail="No public journeys found")
-    return journeys
+async def list_public_journeys(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    sort: Literal["recent", "popular"] = "recent",
+    if_none_match: str | None = Header(None),
+):
+    """
+    One page of the public catalog (username, chapter and fork counts); pass next_cursor back as
+    `cursor` for the next page. Served from a pre-serialized page cache with ETag / 304 support.
+    """
+    try:
+        body, etag = await get_catalog_page_bytes(limit=limit, cursor=cursor, sort=sort)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.catalog_http_max_age_seconds}",
+    }
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.post("/journeys", response_model=JourneyCreateResponse)
@@ -47,37 +87,70 @@ async def create_journey_route(body: JourneyCreate, user: CurrentUser):
     return JourneyCreateResponse(id=jid)
 
 
-@router.post("/journeys/playlist", response_model=JourneyCreateResponse)
+@router.post(
+    "/journeys/playlist",
+    response_model=PlaylistCreateResponse | PlaylistImportResponse,
+    responses={202: {"model": PlaylistImportResponse}},
+)
 async def create_journey_from_playlist(
-    body: PlaylistCreate, user: CurrentUser, background_tasks: BackgroundTasks
+    body: PlaylistCreate,
+    user: CurrentUser,
+    background_tasks: BackgroundTasks,
+    response: Response,
 ):
+    """
+    Create a journey from a YouTube playlist. With "async": true the journey is created from the
+    playlist details and a 202 with an import id is returned; chapters are imported in the background
+    (see GET /journeys/{id}/import-status).
+    """
     playlist_id = body.playlistId
     if not playlist_id:
         raise HTTPException(status_code=400, detail="Playlist ID is required")
-    title, description = await get_playlist_details(playlist_id)
     user_id = user.get("id")
+    if body.async_import:
+        title, description = await get_playlist_details(playlist_id)
+        jid = await create_journey(
+            title=title,
+            description=description,
+            is_public=body.is_public,
+            user_id=user_id,
+        )
+        import_id = await start_playlist_import(jid, playlist_id, user_id)
+        background_tasks.add_task(run_playlist_import, import_id, jid, playlist_id)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return PlaylistImportResponse(id=jid, importId=import_id, status="running")
+
+    truncated = False
+
+    async def on_truncated(limit: int) -> None:
+        nonlocal truncated
+        truncated = True
+
+    # Fetch the playlist details and the first items page concurrently
+    pages = iter_playlist_video_pages(playlist_id, on_truncated)
+    first_page = asyncio.create_task(anext(pages, None))
+    try:
+        title, description = await get_playlist_details(playlist_id)
+    except BaseException:
+        first_page.cancel()
+        raise
     jid = await create_journey(
         title=title,
         description=description,
         is_public=body.is_public,
         user_id=user_id,
     )
-    videos = await get_playlist_videos(playlist_id)
-    video_links = []
-    for v in videos:
-        video_link = v.get("videoLink", "no video")
-        video_links.append(video_link)
-        await create_chapter(
-            journey_id=jid,
-            title=v.get("title", ""),
-            description=v.get("description", ""),
-            video_link=video_link,
-            external_link="",
-            chapter_no=v.get("chapterNo", 1),
-        )
-    # Single background task processes all playlist transcripts sequentially (avoids thread/rate-limit issues)
-    background_tasks.add_task(schedule_playlist_transcripts, video_links, jid)
-    return JourneyCreateResponse(id=jid)
+
+    async def all_pages():
+        page = await first_page
+        if page is not None:
+            yield page
+        async for page in pages:
+            yield page
+
+    transcript_videos = await insert_playlist_pages(jid, all_pages())
+    await schedule_transcripts(background_tasks, jid, transcript_videos)
+    return PlaylistCreateResponse(id=jid, truncated=truncated)
 
 
 @router.get("/journeys")
@@ -85,6 +158,12 @@ async def list_journeys(user: CurrentUser):
     return await get_all_journeys(user["id"])
 
 
+@router.get("/journeys/progress")
+async def list_journeys_progress(user: CurrentUser):
+    """Total and completed chapter counts for each of the user's journeys, in one round trip."""
+    return await get_journeys_progress(user["id"])
+
+
 @router.get("/journeys/{journey_id}")
 async def get_journey(journey_id: str, user: CurrentUser):
     journey = await get_journey_by_id(journey_id)
@@ -93,6 +172,60 @@ async def get_journey(journey_id: str, user: CurrentUser):
     return journey
 
 
+def _parse_fields(value: str | None, allowed: tuple[str, ...], name: str) -> tuple[str, ...]:
+    if value is None:
+        return allowed
+    fields = tuple(f.strip() for f in value.split(",") if f.strip())
+    if not fields:
+        # An empty projection would make Mongo return whole documents
+        raise HTTPException(status_code=400, detail=f"{name} must name at least one field")
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown {name}: {', '.join(unknown)}")
+    return fields
+
+
+@router.get("/journeys/{journey_id}/full")
+async def get_journey_full_route(
+    journey_id: str,
+    user: CurrentUser,
+    chapter_fields: str | None = None,
+    note_fields: str | None = None,
+    notes: bool = True,
+):
+    """
+    Journey, chapters and notes (nested per chapter) in one response. chapter_fields / note_fields are
+    comma-separated subsets (e.g. note_fields=title,created_at to drop note bodies); notes=false omits notes.
+    """
+    chapters = _parse_fields(chapter_fields, CHAPTER_FIELDS, "chapter_fields")
+    note_projection = _parse_fields(note_fields, NOTE_FIELDS, "note_fields") if notes else None
+    journey = await get_journey_full(journey_id, user["id"], chapters, note_projection)
+    if not journey:
+        raise HTTPException(status_code=404, detail="Journey not found")
+    return journey
+
+
+@router.get("/journeys/{journey_id}/transcripts/status")
+async def get_transcript_status(journey_id: str, user: CurrentUser):
+    """Transcript counts per state (queued/running/done/failed) for a journey."""
+    journey = await get_journey_by_id(journey_id)
+    if not journey:
+        raise HTTPException(status_code=404, detail="Journey not found")
+    return await get_journey_transcript_progress(journey_id)
+
+
+@router.get("/journeys/{journey_id}/import-status")
+async def get_playlist_import_status(journey_id: str, user: CurrentUser):
+    """Progress of an async playlist import: state, chapters imported so far and transcript counts."""
+    journey = await get_journey_by_id(journey_id)
+    if not journey:
+        raise HTTPException(status_code=404, detail="Journey not found")
+    import_status = await get_import_status(journey_id)
+    if not import_status:
+        raise HTTPException(status_code=404, detail="No playlist import for this journey")
+    return import_status
+
+
 @router.put("/journeys/{journey_id}")
 async def update_journey_route(journey_id: str, body: JourneyUpdate, user: CurrentUser):
     updated = await update_journey(
@@ -0,0 +1,24 @@
+# app/routers/transcripts.py
+"""Timestamped transcript access (windows around a playback position)."""
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.auth import CurrentUser
+from app.services.transcript_chunks import get_transcript_window
+
+router = APIRouter(prefix="/transcripts", tags=["transcripts"])
+
+
+@router.get("/{video_id}/window")
+async def transcript_window(
+    video_id: str,
+    user: CurrentUser,
+    t: float = Query(..., ge=0, description="Playback position in seconds"),
+    before: float = Query(30, ge=0, le=600),
+    after: float = Query(30, ge=0, le=600),
+):
+    """Transcript segments between t - before and t + after seconds, with their start times."""
+    window = await get_transcript_window(video_id, t, before, after)
+    if window is None:
+        raise HTTPException(status_code=404, detail="Transcript not found")
+    return window
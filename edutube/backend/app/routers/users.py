@@ -11,12 +11,14 @@ from app.schemas import (
     UserLogin,
     TokenResponse,
     UserResponse,
+    UserUpdate,
 )
 from app.services.user_service import (
     create_user,
     find_user_by_email,
     find_user_by_id,
     find_all_users,
+    update_username,
 )
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -67,6 +69,19 @@ async def get_profile(user: CurrentUser):
     return UserResponse(id=str(doc["_id"]), username=doc["username"], email=doc["email"])
 
 
+@router.put("/profile", response_model=UserResponse)
+async def update_profile(body: UserUpdate, user: CurrentUser):
+    """Change the current user's username; their public catalog entries show the new name."""
+    username = body.username.strip()
+    if not username:
+        raise HTTPException(status_code=400, detail="Username is required")
+    uid = user.get("id")
+    if not await update_username(uid, username):
+        raise HTTPException(status_code=404, detail="User not found")
+    doc = await find_user_by_id(uid)
+    return UserResponse(id=str(doc["_id"]), username=doc["username"], email=doc["email"])
+
+
 @router.get("")
 async def get_users():
     """Return all users (list of { id, username, email, ... })."""
@@ -25,6 +25,10 @@ class UserResponse(BaseModel):
     email: str
 
 
+class UserUpdate(BaseModel):
+    username: str = Field(..., min_length=1)
+
+
 class UserCreateResponse(BaseModel):
     id: str
 
@@ -60,9 +64,22 @@ class JourneyCreateResponse(BaseModel):
     id: str
 
 
+class PlaylistCreateResponse(BaseModel):
+    id: str
+    truncated: bool = False  # The playlist had more than PLAYLIST_MAX_VIDEOS videos; only those were imported
+
+
+class PlaylistImportResponse(BaseModel):
+    id: str
+    importId: str
+    status: str
+
+
 class PlaylistCreate(BaseModel):
     playlistId: str = Field(..., alias="playlistId")
     is_public: bool = False
+    # Return 202 after creating the journey and import chapters in the background
+    async_import: bool = Field(False, alias="async")
 
     model_config = {"populate_by_name": True}
 
@@ -104,6 +121,25 @@ class ChapterCreateResponse(BaseModel):
     id: str
 
 
+class ChapterBatchCreate(BaseModel):
+    chapters: list[ChapterCreate] = Field(..., min_length=1, max_length=500)
+
+
+class ChapterBatchCreateResponse(BaseModel):
+    ids: list[str]
+
+
+class ChapterProgressUpdate(BaseModel):
+    # Mark many chapters of one journey complete / incomplete for the current user
+    chapter_ids: list[str] = Field(..., min_length=1)
+    is_completed: bool
+
+
+class ChapterReorder(BaseModel):
+    # Every chapter id of the journey, in the new order; chapter_no becomes position + 1
+    chapter_ids: list[str] = Field(..., min_length=1)
+
+
 # ----- Notes -----
 class NoteCreate(BaseModel):
     content: str
@@ -138,12 +174,17 @@ class ChatRequest(BaseModel):
     message: str
     context: str | None = None
     use_knowledge: bool = False  # When True, prefer knowledge-base context (config only; still uses Nova Lite)
+    no_cache: bool = False  # When True, skip the answer cache and always call Bedrock
+    journey_id: str | None = None  # Optional: restrict knowledge retrieval to one journey (local backend)
+    chapter_id: str | None = None  # Optional: ground the answer on this chapter's video transcript (server-side)
+    timestamp: float | None = Field(None, ge=0)  # Optional: playback position (seconds) within the chapter video
 
 
 class ChatResponse(BaseModel):
     response: str
     success: bool = True
     fallback: bool = False
+    cached: bool = False
 
 
 class HealthResponse(BaseModel):
@@ -0,0 +1,147 @@
+# app/services/admission.py
+"""
+Admission control for Bedrock-bound chat traffic: a concurrency limit with a bounded wait queue
+and queue-time deadline, plus jittered exponential backoff for throttled calls.
+"""
+
+import asyncio
+import math
+import random
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+# Error codes Bedrock returns when it is shedding load; safe to retry
+RETRYABLE_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceUnavailableException",
+    "ModelNotReadyException",
+}
+
+
+class Overloaded(Exception):
+    """Raised when a request cannot be admitted; retry_after is a suggested delay in seconds."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def error_code(e: Exception) -> str:
+    """botocore ClientError code (or exception class name for modeled/stream errors)."""
+    response = getattr(e, "response", None)
+    if isinstance(response, dict):
+        code = (response.get("Error") or {}).get("Code")
+        if code:
+            return code
+    return type(e).__name__
+
+
+def is_throttling(e: Exception) -> bool:
+    code = error_code(e)
+    return code in RETRYABLE_CODES or any(c in str(e) for c in RETRYABLE_CODES)
+
+
+class AdmissionController:
+    """
+    At most max_concurrent holders; up to max_queue callers wait, each for at most queue_timeout
+    seconds. Anything beyond that is rejected with Overloaded instead of piling up.
+    """
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._sem = asyncio.Semaphore(max_concurrent)
+        self.in_use = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_deadline = 0
+        self._wait_total = 0.0
+        self.max_wait = 0.0
+        self._hold_avg = 1.0  # EWMA of slot hold time, seeds Retry-After estimates
+
+    def retry_after(self) -> int:
+        """Rough seconds until a queued request would be served."""
+        backlog = (self.queued + 1) / max(1, self.max_concurrent)
+        return max(1, math.ceil(self._hold_avg * backlog))
+
+    def saturated(self) -> bool:
+        """True when a new caller would be rejected right away (queue full)."""
+        return self._sem.locked() and self.queued >= self.max_queue
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        if self.saturated():
+            self.rejected_queue_full += 1
+            raise Overloaded("Chat service is busy; please retry shortly.", self.retry_after())
+        start = time.monotonic()
+        if not self._sem.locked():
+            await self._sem.acquire()  # free slot: returns without suspending
+        else:
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+            try:
+                await asyncio.wait_for(self._sem.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected_deadline += 1
+                raise Overloaded(
+                    "Chat request timed out waiting in queue; please retry.", self.retry_after()
+                )
+            finally:
+                self.queued -= 1
+        waited = time.monotonic() - start
+        self._wait_total += waited
+        self.max_wait = max(self.max_wait, waited)
+        self.admitted += 1
+        self.in_use += 1
+        held_from = time.monotonic()
+        try:
+            yield
+        finally:
+            self.in_use -= 1
+            self._sem.release()
+            self._hold_avg = 0.8 * self._hold_avg + 0.2 * (time.monotonic() - held_from)
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "in_use": self.in_use,
+            "queue_depth": self.queued,
+            "max_queue_depth": self.max_queued,
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_deadline": self.rejected_deadline,
+            "avg_wait_seconds": round(self._wait_total / self.admitted, 4) if self.admitted else 0.0,
+            "max_wait_seconds": round(self.max_wait, 4),
+        }
+
+
+async def with_backoff(
+    fn: Callable[[], Awaitable[T]],
+    *,
+    max_retries: int,
+    base_delay: float,
+    max_delay: float,
+    stats: dict[str, Any] | None = None,
+) -> T:
+    """Await fn(), retrying throttling errors with full-jitter exponential backoff."""
+    attempt = 0
+    while True:
+        try:
+            return await fn()
+        except Exception as e:
+            if attempt >= max_retries or not is_throttling(e):
+                raise
+            attempt += 1
+            if stats is not None:
+                stats["retries"] = stats.get("retries", 0) + 1
+            await asyncio.sleep(random.uniform(0, min(max_delay, base_delay * 2**attempt)))
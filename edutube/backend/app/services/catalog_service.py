@@ -0,0 +1,264 @@
+# app/services/catalog_service.py
+"""
+Materialized public catalog (public_catalog collection): one document per public journey, keyed by
+the journey's _id, with owner username, chapter count and fork count denormalized so the Explore
+listing is a plain indexed scan with no join.
+
+Kept current by write-through hooks in journey/chapter/user services; counters are $inc'd, so a
+rebuild (`python rebuild_catalog.py`) recomputes everything from journeys, chapters and users.
+
+Pages are also cached pre-serialized (JSON bytes + ETag) in process. Every catalog write bumps a
+version that is part of the cache key, so a page rendered before a write is never served after it.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+from datetime import datetime
+
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+from app.config import settings
+from app.database import get_db
+from app.services.single_flight import SingleFlight
+from app.services.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+_ITEM_FIELDS = {"title": 1, "description": 1, "username": 1, "chapter_count": 1, "fork_count": 1}
+
+_cache: TTLCache | None = None
+_flight = SingleFlight("catalog")
+_version = 0
+
+
+def _get_cache() -> TTLCache:
+    global _cache  # noqa: PLW0603
+    if _cache is None:
+        _cache = TTLCache(settings.catalog_cache_max_entries, settings.catalog_cache_ttl_seconds)
+    return _cache
+
+
+def invalidate_catalog_cache() -> None:
+    """Drop every cached page (lazily: entries under the old version are never read again and age out)."""
+    global _version  # noqa: PLW0603
+    _version += 1
+
+
+def _oid(s: str) -> ObjectId | None:
+    try:
+        return ObjectId(s)
+    except Exception:
+        return None
+
+
+async def sync_catalog_entry(journey_id: str) -> None:
+    """Recompute one journey's entry: upsert it if the journey is public, remove it otherwise."""
+    oid = _oid(journey_id)
+    if not oid:
+        return
+    db = get_db()
+    journey = await db.journeys.find_one(
+        {"_id": oid},
+        {"title": 1, "description": 1, "is_public": 1, "user_id": 1, "fork_count": 1},
+    )
+    if not journey or not journey.get("is_public"):
+        r = await db.public_catalog.delete_one({"_id": oid})
+        if r.deleted_count:
+            invalidate_catalog_cache()
+        return
+    user_id = journey.get("user_id") or ""
+    owner_oid = _oid(user_id)
+    owner = await db.users.find_one({"_id": owner_oid}, {"username": 1}) if owner_oid else None
+    entry = {
+        "title": journey.get("title"),
+        "description": journey.get("description"),
+        "user_id": user_id,
+        "username": (owner or {}).get("username"),
+        "chapter_count": await db.chapters.count_documents({"journey_id": journey_id}),
+        "fork_count": journey.get("fork_count") or 0,
+        "updated_at": datetime.utcnow(),
+    }
+    await db.public_catalog.replace_one({"_id": oid}, entry, upsert=True)
+    invalidate_catalog_cache()
+
+
+async def remove_catalog_entry(journey_id: str) -> None:
+    oid = _oid(journey_id)
+    if not oid:
+        return
+    r = await get_db().public_catalog.delete_one({"_id": oid})
+    if r.deleted_count:
+        invalidate_catalog_cache()
+
+
+async def adjust_catalog_counts(journey_id: str, *, chapters: int = 0, forks: int = 0) -> None:
+    """$inc chapter/fork counters on a journey's entry; no-op for journeys not in the catalog."""
+    oid = _oid(journey_id)
+    if not oid or not (chapters or forks):
+        return
+    r = await get_db().public_catalog.update_one(
+        {"_id": oid},
+        {"$inc": {"chapter_count": chapters, "fork_count": forks}},
+    )
+    if r.matched_count:
+        invalidate_catalog_cache()
+
+
+async def rename_catalog_owner(user_id: str, username: str) -> None:
+    r = await get_db().public_catalog.update_many({"user_id": user_id}, {"$set": {"username": username}})
+    if r.modified_count:
+        invalidate_catalog_cache()
+
+
+async def rebuild_catalog() -> int:
+    """Recompute the whole catalog server-side ($out swaps the collection atomically, keeping indexes)."""
+    db = get_db()
+    # user_id in journeys is stored as string; users._id is ObjectId (a malformed id matches no owner)
+    owner_oid = {"$convert": {"input": "$user_id", "to": "objectId", "onError": None, "onNull": None}}
+    pipeline = [
+        {"$match": {"is_public": True}},
+        {
+            "$lookup": {
+                "from": "users",
+                "let": {"uid": owner_oid},
+                "pipeline": [
+                    {"$match": {"$expr": {"$eq": ["$_id", "$$uid"]}}},
+                    {"$project": {"username": 1}},
+                ],
+                "as": "owner",
+            }
+        },
+        {
+            "$lookup": {
+                "from": "chapters",
+                "let": {"jid": {"$toString": "$_id"}},
+                "pipeline": [
+                    {"$match": {"$expr": {"$eq": ["$journey_id", "$$jid"]}}},
+                    {"$count": "n"},
+                ],
+                "as": "chapters",
+            }
+        },
+        {
+            "$project": {
+                "title": 1,
+                "description": 1,
+                "user_id": 1,
+                "username": {"$first": "$owner.username"},
+                "chapter_count": {"$ifNull": [{"$first": "$chapters.n"}, 0]},
+                "fork_count": {"$ifNull": ["$fork_count", 0]},
+                "updated_at": "$$NOW",
+            }
+        },
+        {"$out": "public_catalog"},
+    ]
+    async for _ in db.journeys.aggregate(pipeline):
+        pass
+    invalidate_catalog_cache()
+    return await db.public_catalog.count_documents({})
+
+
+async def ensure_catalog() -> int | None:
+    """
+    Build the catalog on startup if it was never materialized (an existing database with public journeys
+    but an empty public_catalog). Returns the rebuilt size, or None if nothing needed doing.
+
+    Only one process builds it: the first to insert the migrations marker; the others skip. A failed
+    build drops the marker so the next start retries; `python rebuild_catalog.py` always rebuilds.
+    """
+    db = get_db()
+    if await db.public_catalog.count_documents({}, limit=1):
+        return None
+    if not await db.journeys.count_documents({"is_public": True}, limit=1):
+        return None
+    try:
+        await db.migrations.insert_one({"_id": "public_catalog", "started_at": datetime.utcnow()})
+    except DuplicateKeyError:
+        logger.info("Public catalog build already claimed by another process; skipping")
+        return None
+    try:
+        return await rebuild_catalog()
+    except Exception:
+        await db.migrations.delete_one({"_id": "public_catalog"})
+        raise
+
+
+def _encode_cursor(doc: dict, sort: str) -> str:
+    key = {"id": str(doc["_id"])}
+    if sort == "popular":
+        key["f"] = doc.get("fork_count", 0)
+    return base64.urlsafe_b64encode(json.dumps(key, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort: str) -> dict:
+    """Keyset filter continuing after the cursor's row; raises ValueError on a malformed cursor."""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        last_id = ObjectId(key["id"])
+        forks = int(key.get("f", 0))
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+    if sort != "popular":
+        return {"_id": {"$lt": last_id}}
+    return {
+        "$or": [
+            {"fork_count": {"$lt": forks}},
+            {"fork_count": forks, "_id": {"$lt": last_id}},
+        ]
+    }
+
+
+async def get_catalog_page(
+    limit: int = 20,
+    cursor: str | None = None,
+    sort: str = "recent",
+) -> dict:
+    """
+    One page of the public catalog, newest first ("recent") or by fork count ("popular").
+    Keyset pagination: pass the returned next_cursor to continue; it is None on the last page.
+    """
+    query = _decode_cursor(cursor, sort) if cursor else {}
+    order = [("_id", -1)] if sort != "popular" else [("fork_count", -1), ("_id", -1)]
+    docs = await get_db().public_catalog.find(query, _ITEM_FIELDS).sort(order).limit(limit + 1).to_list(limit + 1)
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+    items = [
+        {
+            "id": str(d["_id"]),
+            "title": d.get("title"),
+            "description": d.get("description"),
+            "is_public": True,
+            "username": d.get("username"),
+            "chapter_count": d.get("chapter_count", 0),
+            "fork_count": d.get("fork_count", 0),
+        }
+        for d in docs
+    ]
+    return {
+        "items": items,
+        "next_cursor": _encode_cursor(docs[-1], sort) if has_more else None,
+    }
+
+
+async def _render_page(key: str, limit: int, cursor: str | None, sort: str) -> tuple[bytes, str]:
+    page = await get_catalog_page(limit=limit, cursor=cursor, sort=sort)
+    body = json.dumps(page, separators=(",", ":")).encode("utf-8")
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    _get_cache().set(key, (body, etag))
+    return body, etag
+
+
+async def get_catalog_page_bytes(
+    limit: int = 20,
+    cursor: str | None = None,
+    sort: str = "recent",
+) -> tuple[bytes, str]:
+    """Serialized catalog page and its ETag, from cache when possible; concurrent misses share one query."""
+    key = f"{_version}|{sort}|{limit}|{cursor or ''}"
+    hit = _get_cache().get(key)
+    if hit is not None:
+        return hit
+    return await _flight.do(key, lambda: _render_page(key, limit, cursor, sort))
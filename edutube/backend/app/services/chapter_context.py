@@ -0,0 +1,113 @@
+# app/services/chapter_context.py
+"""
+Server-side transcript context for chapter-scoped chat: given a chapter (and optionally the playback
+position), pull a bounded excerpt of that chapter's video transcript from transcript_chunks.
+Chapter -> video and video -> chunks lookups are cached in process.
+"""
+
+import re
+
+from app.config import settings
+from app.services.chapter_service import get_chapter_by_id
+from app.services.kb_retrieval import estimate_tokens, pack_chunks
+from app.services.knowledge_pipeline import extract_video_id
+from app.services.transcript_chunks import get_video_chunks, merge_window
+from app.services.ttl_cache import TTLCache
+
+_WORD = re.compile(r"\w+")
+
+_chapters = TTLCache(1000, 600)
+_video_chunks = TTLCache(200, 600)
+
+
+async def _chapter_video(chapter_id: str) -> tuple[str, str] | None:
+    """(chapter title, video id) for a chapter with a YouTube link, cached."""
+    cached = _chapters.get(chapter_id)
+    if cached is not None:
+        return cached or None  # "" caches "no video"
+    chapter = await get_chapter_by_id(chapter_id)
+    video_id = extract_video_id(chapter.get("video_link", "")) if chapter else None
+    value = (chapter.get("title") or "", video_id) if video_id else ""
+    _chapters.set(chapter_id, value)
+    return value or None
+
+
+async def _chunks(video_id: str) -> list[dict]:
+    cached = _video_chunks.get(video_id)
+    if cached is None:
+        cached = await get_video_chunks(video_id)
+        if cached:  # don't cache "not processed yet"; the pipeline may still be running
+            _video_chunks.set(video_id, cached)
+    return cached
+
+
+def _fmt_time(seconds: float) -> str:
+    m, s = divmod(int(seconds), 60)
+    h, m = divmod(m, 60)
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m}:{s:02d}"
+
+
+def _window_excerpt(chunks: list[dict], t: float, max_tokens: int) -> str:
+    """Segments around t, widened before/after by the configured amounts, trimmed to the budget from the far end."""
+    lo = max(0.0, t - settings.chapter_context_before_seconds)
+    hi = t + settings.chapter_context_after_seconds
+    segments = merge_window(chunks, lo, hi)
+    # Drop segments farthest from t until the excerpt fits
+    while segments and estimate_tokens(" ".join(s[1] for s in segments)) > max_tokens:
+        if abs(segments[0][0] - t) >= abs(segments[-1][0] - t):
+            segments.pop(0)
+        else:
+            segments.pop()
+    return " ".join(s[1] for s in segments)
+
+
+def _relevant_excerpt(chunks: list[dict], question: str, max_tokens: int) -> str:
+    """
+    Chunks sharing words with the question, most overlapping first, packed into the budget and
+    returned in playback order. Falls back to the opening of the video when nothing matches.
+    """
+    terms = {w for w in _WORD.findall(question.lower()) if len(w) > 2}
+    scored = []
+    for i, chunk in enumerate(chunks):
+        words = set(_WORD.findall(chunk["text"].lower()))
+        scored.append((len(terms & words), -i, chunk))
+    scored.sort(reverse=True)
+    picked: list[dict] = []
+    budget = max_tokens
+    for score, _, chunk in scored:
+        if score == 0:
+            break  # unrelated chunks only cost tokens
+        cost = estimate_tokens(chunk["text"])
+        if cost > budget:
+            continue
+        picked.append(chunk)
+        budget -= cost
+    picked.sort(key=lambda c: c["start"])
+    if not picked and chunks:
+        return pack_chunks([chunks[0]["text"]], max_tokens)
+    return "\n\n".join(f"[{_fmt_time(c['start'])}] {c['text']}" for c in picked)
+
+
+async def build_chapter_context(
+    chapter_id: str,
+    question: str,
+    timestamp: float | None = None,
+) -> tuple[str, str] | None:
+    """
+    (chapter title, transcript excerpt) for chat, or None if the chapter has no processed transcript.
+    With a timestamp the excerpt is the window around it; otherwise the chunks most related to the question.
+    """
+    chapter = await _chapter_video(chapter_id)
+    if chapter is None:
+        return None
+    title, video_id = chapter
+    chunks = await _chunks(video_id)
+    if not chunks:
+        return None
+    max_tokens = settings.chapter_context_max_tokens
+    if timestamp is not None:
+        excerpt = _window_excerpt(chunks, timestamp, max_tokens)
+        if excerpt:
+            return title, f"(around {_fmt_time(timestamp)}) {excerpt}"
+    excerpt = _relevant_excerpt(chunks, question, max_tokens)
+    return (title, excerpt) if excerpt else None
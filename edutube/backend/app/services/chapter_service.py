@@ -2,9 +2,12 @@
 """Chapter CRUD using MongoDB."""
 
 from bson import ObjectId
+from pymongo import UpdateOne
 
 from app.database import get_db
 from app.schemas import doc_to_chapter
+from app.services.catalog_service import adjust_catalog_counts
+from app.services.progress_service import allocate_positions, clear_position, ensure_positions
 
 
 def _oid(s: str) -> ObjectId | None:
@@ -23,20 +26,68 @@ async def create_chapter(
     chapter_no: int,
 ) -> str:
     db = get_db()
+    slots = await allocate_positions(journey_id, 1)
     result = await db.chapters.insert_one(
         {
             "title": title,
             "description": description or "",
             "video_link": video_link,
             "external_link": external_link or "",
-            "is_completed": False,
             "chapter_no": chapter_no,
+            "position": slots[0] if slots else None,
             "journey_id": journey_id,
         }
     )
+    await adjust_catalog_counts(journey_id, chapters=1)
     return str(result.inserted_id)
 
 
+async def create_chapters(journey_id: str, chapters: list[dict]) -> list[str]:
+    """
+    Insert many chapters in one round trip; each item has title, description, video_link,
+    external_link, chapter_no. Returns new ids in input order.
+    """
+    if not chapters:
+        return []
+    positions = list(await allocate_positions(journey_id, len(chapters))) or [None] * len(chapters)
+    docs = [
+        {
+            "title": ch.get("title") or "",
+            "description": ch.get("description") or "",
+            "video_link": ch.get("video_link") or "",
+            "external_link": ch.get("external_link") or "",
+            "chapter_no": ch.get("chapter_no", 1),
+            "position": pos,
+            "journey_id": journey_id,
+        }
+        for ch, pos in zip(chapters, positions)
+    ]
+    result = await get_db().chapters.insert_many(docs, ordered=True)
+    await adjust_catalog_counts(journey_id, chapters=len(result.inserted_ids))
+    return [str(i) for i in result.inserted_ids]
+
+
+async def reorder_chapters(journey_id: str, chapter_ids: list[str]) -> int | None:
+    """
+    Set chapter_no = position + 1 for each id in one ordered bulk_write. chapter_ids must be exactly the
+    journey's chapters (a partial list would leave the others colliding with the new numbers).
+    Returns the number matched, or None if an id is malformed or the set differs from the journey's.
+    """
+    oids = [_oid(cid) for cid in chapter_ids]
+    if any(oid is None for oid in oids):
+        return None
+    db = get_db()
+    existing = {doc["_id"] async for doc in db.chapters.find({"journey_id": journey_id}, {"_id": 1})}
+    if len(oids) != len(existing) or set(oids) != existing:
+        return None
+    ops = [
+        UpdateOne({"_id": oid, "journey_id": journey_id}, {"$set": {"chapter_no": i}})
+        for i, oid in enumerate(oids, start=1)
+    ]
+    r = await db.chapters.bulk_write(ops, ordered=True)
+    return r.matched_count
+
+
 async def get_chapters_by_journey_id(journey_id: str) -> list[dict]:
     db = get_db()
     cursor = db.chapters.find({"journey_id": journey_id}).sort("chapter_no", 1)
@@ -84,20 +135,28 @@ async def update_chapter(
     return r.modified_count > 0
 
 
-async def update_chapter_complete(chapter_id: str, is_completed: bool) -> bool:
-    oid = _oid(chapter_id)
-    if not oid:
-        return False
-    r = await get_db().chapters.update_one(
-        {"_id": oid},
-        {"$set": {"is_completed": is_completed}},
-    )
-    return r.modified_count > 0
+async def get_chapter_positions(journey_id: str, chapter_ids: list[str]) -> list[int] | None:
+    """Progress slots of the given chapters of a journey; None if an id is malformed or not in the journey."""
+    oids = [_oid(cid) for cid in chapter_ids]
+    if any(oid is None for oid in oids):
+        return None
+    docs = await get_db().chapters.find(
+        {"_id": {"$in": oids}, "journey_id": journey_id},
+        {"position": 1, "chapter_no": 1},
+    ).to_list(None)
+    if len(docs) != len(set(oids)):
+        return None
+    await ensure_positions(journey_id, docs)
+    return [d["position"] for d in docs]
 
 
 async def delete_chapter(chapter_id: str) -> bool:
     oid = _oid(chapter_id)
     if not oid:
         return False
-    r = await get_db().chapters.delete_one({"_id": oid})
-    return r.deleted_count > 0
+    doc = await get_db().chapters.find_one_and_delete({"_id": oid}, projection={"journey_id": 1, "position": 1})
+    if not doc:
+        return False
+    await adjust_catalog_counts(doc.get("journey_id") or "", chapters=-1)
+    await clear_position(doc.get("journey_id") or "", doc.get("position"))
+    return True
@@ -0,0 +1,165 @@
+# app/services/chat_cache.py
+"""
+Chatbot answer cache keyed on normalized message, context, knowledge mode and model id.
+Backends: in-process LRU ("memory") or a shared MongoDB collection ("mongo"); both honour a TTL.
+"""
+
+import hashlib
+import re
+from datetime import datetime, timedelta
+
+from app.config import settings
+from app.database import get_db
+from app.services.ttl_cache import TTLCache
+
+_WS = re.compile(r"\s+")
+
+
+def normalize_text(text: str | None) -> str:
+    """Case-fold, collapse whitespace and drop trailing punctuation so trivial variants share a key."""
+    return _WS.sub(" ", (text or "").strip().lower()).rstrip(" ?!.")
+
+
+def cache_key(
+    message: str,
+    context: str | None,
+    use_knowledge: bool,
+    model_id: str,
+    scope: str | None = None,
+) -> str:
+    """Stable cache key for a chat request; scope is the retrieval filter (e.g. journey id), if any."""
+    raw = "\x1f".join(
+        [
+            normalize_text(message),
+            normalize_text(context),
+            "kb" if use_knowledge else "plain",
+            model_id,
+            scope or "",
+        ]
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class MemoryChatCache:
+    """In-process answer cache: a TTLCache behind the same async interface as MongoChatCache."""
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self._lru = TTLCache(max_entries, ttl_seconds)
+
+    async def get(self, key: str) -> str | None:
+        return self._lru.get(key)
+
+    async def set(self, key: str, value: str) -> None:
+        self._lru.set(key, value)
+
+    async def clear(self) -> None:
+        self._lru.clear()
+
+    def size(self) -> int:
+        return len(self._lru)
+
+
+class MongoChatCache:
+    """
+    Shared cache in the chat_cache collection. Expiry is enforced by a TTL index on expires_at
+    (and re-checked on read, since the TTL monitor only runs once a minute); LRU trimming uses last_used.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+    async def get(self, key: str) -> str | None:
+        now = datetime.utcnow()
+        doc = await get_db().chat_cache.find_one_and_update(
+            {"key": key, "expires_at": {"$gt": now}},
+            {"$set": {"last_used": now}},
+            projection={"value": 1},
+        )
+        return doc.get("value") if doc else None
+
+    async def set(self, key: str, value: str) -> None:
+        db = get_db()
+        now = datetime.utcnow()
+        await db.chat_cache.update_one(
+            {"key": key},
+            {
+                "$set": {
+                    "value": value,
+                    "last_used": now,
+                    "expires_at": now + timedelta(seconds=self.ttl_seconds),
+                }
+            },
+            upsert=True,
+        )
+        excess = await db.chat_cache.estimated_document_count() - self.max_entries
+        if excess > 0:
+            stale = db.chat_cache.find({}, {"_id": 1}).sort("last_used", 1).limit(excess)
+            ids = [d["_id"] async for d in stale]
+            if ids:
+                await db.chat_cache.delete_many({"_id": {"$in": ids}})
+
+    async def clear(self) -> None:
+        await get_db().chat_cache.delete_many({})
+
+    def size(self) -> int | None:
+        return None  # not tracked locally; query the collection if needed
+
+
+ChatCache = MemoryChatCache | MongoChatCache
+
+_cache: ChatCache | None = None
+_stats = {"hits": 0, "misses": 0, "stores": 0, "bypassed": 0}
+
+
+def get_chat_cache() -> ChatCache | None:
+    """Return the configured cache backend, or None when CHAT_CACHE_BACKEND is off."""
+    global _cache  # noqa: PLW0603
+    backend = (settings.chat_cache_backend or "").strip().lower()
+    if backend not in ("memory", "mongo"):
+        return None
+    if _cache is None:
+        cls = MongoChatCache if backend == "mongo" else MemoryChatCache
+        _cache = cls(settings.chat_cache_max_entries, settings.chat_cache_ttl_seconds)
+    return _cache
+
+
+async def get_cached_answer(key: str) -> str | None:
+    """Look up an answer; counts hits and misses. Cache errors are treated as misses."""
+    cache = get_chat_cache()
+    if cache is None:
+        return None
+    try:
+        value = await cache.get(key)
+    except Exception:
+        value = None
+    _stats["hits" if value is not None else "misses"] += 1
+    return value
+
+
+async def store_answer(key: str, value: str) -> None:
+    """Store an answer; failures are ignored so the cache never breaks chat."""
+    cache = get_chat_cache()
+    if cache is None:
+        return
+    try:
+        await cache.set(key, value)
+        _stats["stores"] += 1
+    except Exception:
+        pass
+
+
+def record_bypass() -> None:
+    _stats["bypassed"] += 1
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters plus backend info, for the chatbot stats endpoint."""
+    cache = get_chat_cache()
+    lookups = _stats["hits"] + _stats["misses"]
+    return {
+        "backend": (settings.chat_cache_backend or "off").lower() if cache else "off",
+        **_stats,
+        "hit_ratio": round(_stats["hits"] / lookups, 4) if lookups else 0.0,
+        "size": cache.size() if cache else 0,
+    }
@@ -1,10 +1,19 @@
 # app/services/journey_service.py
 """Journey CRUD and fork logic using MongoDB."""
 
+import asyncio
+from datetime import datetime
+
 from bson import ObjectId
 
 from app.database import get_db
 from app.schemas import doc_to_journey
+from app.services.catalog_service import adjust_catalog_counts, remove_catalog_entry, sync_catalog_entry
+from app.services.progress_service import apply_completion, get_bitsets
+
+
+# Documents per insert_many when forking (keeps each batch well under the 16MB message limit)
+_FORK_BATCH_SIZE = 1000
 
 
 def _oid(s: str) -> ObjectId | None:
@@ -28,9 +37,13 @@ async def create_journey(
             "description": description or "",
             "is_public": is_public,
             "user_id": user_id,
+            "fork_count": 0,
         }
     )
-    return str(result.inserted_id)
+    jid = str(result.inserted_id)
+    if is_public:
+        await sync_catalog_entry(jid)
+    return jid
 
 
 async def get_all_journeys(user_id: str) -> list[dict]:
@@ -42,6 +55,47 @@ async def get_all_journeys(user_id: str) -> list[dict]:
     return out
 
 
+async def get_journeys_progress(user_id: str) -> list[dict]:
+    """
+    Chapter totals and completed counts for every journey the user owns: one $group over chapters
+    (covered by the (journey_id, is_completed) index) for totals and one read of the user's progress
+    bitsets for completion. Journeys without recorded progress fall back to legacy is_completed flags.
+    """
+    db = get_db()
+    journeys = await db.journeys.find({"user_id": user_id}, {"title": 1}).to_list(None)
+    ids = [str(j["_id"]) for j in journeys]
+    counts: dict[str, dict] = {}
+    bitsets = await get_bitsets(user_id, ids) if ids else {}
+    if ids:
+        pipeline = [
+            {"$match": {"journey_id": {"$in": ids}}},
+            {
+                "$group": {
+                    "_id": "$journey_id",
+                    "total": {"$sum": 1},
+                    "completed": {"$sum": {"$cond": ["$is_completed", 1, 0]}},
+                }
+            },
+        ]
+        async for row in db.chapters.aggregate(pipeline):
+            counts[row["_id"]] = row
+    out = []
+    for j, jid in zip(journeys, ids):
+        row = counts.get(jid, {})
+        total = row.get("total", 0)
+        completed = bitsets[jid].bit_count() if jid in bitsets else row.get("completed", 0)
+        out.append(
+            {
+                "journey_id": jid,
+                "title": j.get("title"),
+                "total": total,
+                "completed": completed,
+                "percent": (completed * 100 // total) if total else 0,
+            }
+        )
+    return out
+
+
 async def get_journey_by_id(journey_id: str) -> dict | None:
     oid = _oid(journey_id)
     if not oid:
@@ -52,6 +106,66 @@ async def get_journey_by_id(journey_id: str) -> dict | None:
     return doc_to_journey(doc)
 
 
+CHAPTER_FIELDS = ("title", "description", "video_link", "external_link", "is_completed", "chapter_no")
+NOTE_FIELDS = ("title", "content", "created_at", "updated_at")
+
+
+async def get_journey_full(
+    journey_id: str,
+    user_id: str,
+    chapter_fields: tuple[str, ...] = CHAPTER_FIELDS,
+    note_fields: tuple[str, ...] | None = NOTE_FIELDS,
+) -> dict | None:
+    """
+    Journey with its chapters (by chapter_no) and each chapter's notes nested, read concurrently.
+    Only the requested fields are projected; note_fields=None skips the notes query entirely.
+    is_completed is the given user's progress, not a chapter field.
+    """
+    oid = _oid(journey_id)
+    if not oid:
+        return None
+    db = get_db()
+
+    async def load_chapters() -> list[dict]:
+        projection = {"_id": 1} | dict.fromkeys(chapter_fields, 1)  # never empty (empty = whole documents)
+        if "is_completed" in chapter_fields:
+            projection |= {"position": 1, "chapter_no": 1}
+        cursor = db.chapters.find({"journey_id": journey_id}, projection)
+        return await cursor.sort("chapter_no", 1).to_list(None)
+
+    async def load_notes() -> list[dict]:
+        if note_fields is None:
+            return []
+        projection = dict.fromkeys(note_fields, 1) | {"chapter_id": 1}
+        cursor = db.notes.find({"journey_id": journey_id}, projection)
+        return await cursor.sort([("chapter_id", 1), ("created_at", 1)]).to_list(None)
+
+    journey, chapters, notes = await asyncio.gather(
+        db.journeys.find_one({"_id": oid}),
+        load_chapters(),
+        load_notes(),
+    )
+    if not journey:
+        return None
+    by_chapter: dict[str, list[dict]] = {}
+    for note in notes:
+        note["id"] = str(note.pop("_id"))
+        by_chapter.setdefault(note.pop("chapter_id", None) or "", []).append(note)
+    if "is_completed" in chapter_fields:
+        await apply_completion(user_id, journey_id, chapters, owner_id=journey.get("user_id") or "")
+    out = doc_to_journey(journey)
+    out["chapters"] = []
+    for ch in chapters:
+        for internal in ("position", "chapter_no"):
+            if internal not in chapter_fields:
+                ch.pop(internal, None)
+        ch["id"] = str(ch.pop("_id"))
+        if note_fields is not None:
+            ch["notes"] = by_chapter.get(ch["id"], [])
+        out["chapters"].append(ch)
+    return out
+
+
 async def update_journey(
     journey_id: str,
     user_id: str,
@@ -75,6 +189,8 @@ async def update_journey(
         {"_id": oid, "user_id": user_id},
         {"$set": update},
     )
+    if r.modified_count:
+        await sync_catalog_entry(journey_id)
     return r.modified_count > 0
 
 
@@ -83,52 +199,17 @@ async def delete_journey(journey_id: str, user_id: str) -> bool:
     if not oid:
         return False
     r = await get_db().journeys.delete_one({"_id": oid, "user_id": user_id})
+    if r.deleted_count:
+        await remove_catalog_entry(journey_id)
     return r.deleted_count > 0
 
 
-async def get_all_public_journeys() -> list[dict]:
-    """Return public journeys with username from users collection."""
-    # user_id in journeys is stored as string; users._id is ObjectId
-    cond = [
-        {"$and": [{"$ne": ["$user_id", None]}, {"$ne": ["$user_id", ""]}]},
-        {"$toObjectId": "$user_id"},
-        None,
-    ]
-    pipeline = [
-        {"$match": {"is_public": True}},
-        {
-            "$lookup": {
-                "from": "users",
-                "let": {"uid": {"$cond": cond}},
-                "pipeline": [
-                    {"$match": {"$expr": {"$eq": ["$_id", "$$uid"]}}},
-                    {"$project": {"username": 1}},
-                ],
-                "as": "user_doc",
-            }
-        },
-        {"$unwind": {"path": "$user_doc", "preserveNullAndEmptyArrays": True}},
-        {
-            "$project": {
-                "id": {"$toString": "$_id"},
-                "title": 1,
-                "description": 1,
-                "is_public": 1,
-                "username": "$user_doc.username",
-            }
-        },
-    ]
-    db = get_db()
-    out = []
-    async for doc in db.journeys.aggregate(pipeline):
-        if "_id" in doc:
-            del doc["_id"]
-        out.append(doc)
-    return out
-
-
 async def fork_journey(journey_id: str, user_id: str) -> str:
-    """Copy journey, its chapters and notes for the user; returns new journey id."""
+    """
+    Copy journey, its chapters and notes for the user; returns new journey id.
+    Chapter ids are allocated client-side so the old -> new map is known up front: chapters and
+    notes are then written concurrently with batched insert_many calls.
+    """
     journey = await get_journey_by_id(journey_id)
     if not journey:
         raise ValueError("Journey not found")
@@ -140,36 +221,67 @@ async def fork_journey(journey_id: str, user_id: str) -> str:
         is_public=False,
         user_id=user_id,
     )
-    new_oid = ObjectId(new_jid)
     db = get_db()
+    await db.journeys.update_one({"_id": ObjectId(journey_id)}, {"$inc": {"fork_count": 1}})
+    await adjust_catalog_counts(journey_id, forks=1)
+    if journey.get("chapter_slots"):
+        # Chapters keep their progress slots, so continue the fork's slot counter from the source
+        await db.journeys.update_one({"_id": ObjectId(new_jid)}, {"$set": {"chapter_slots": journey["chapter_slots"]}})
 
-    # Copy chapters and build old_id -> new_id map
+    chapter_fields = {
+        "title": 1,
+        "description": 1,
+        "video_link": 1,
+        "external_link": 1,
+        "chapter_no": 1,
+        "position": 1,
+    }
     old_to_new_chapter: dict[str, str] = {}
-    async for ch in db.chapters.find({"journey_id": journey_id}):
-        new_ch = await db.chapters.insert_one(
+    chapter_docs = []
+    async for ch in db.chapters.find({"journey_id": journey_id}, chapter_fields):
+        new_id = ObjectId()
+        old_to_new_chapter[str(ch["_id"])] = str(new_id)
+        chapter_docs.append(
             {
+                "_id": new_id,
                 "title": ch.get("title") or "Untitled Chapter",
                 "description": ch.get("description") or "",
                 "video_link": ch.get("video_link") or "",
                 "external_link": ch.get("external_link") or "",
-                "is_completed": False,
                 "chapter_no": ch.get("chapter_no", 1),
+                "position": ch.get("position"),
                 "journey_id": new_jid,
             }
         )
-        old_to_new_chapter[str(ch["_id"])] = str(new_ch.inserted_id)
-
-    # Copy notes
-    async for note in db.notes.find({"journey_id": journey_id}):
-        old_ch_id = str(note.get("chapter_id") or "")
-        new_ch_id = old_to_new_chapter.get(old_ch_id)
-        if new_ch_id:
-            await db.notes.insert_one(
+
+    async def copy_chapters() -> None:
+        for i in range(0, len(chapter_docs), _FORK_BATCH_SIZE):
+            await db.chapters.insert_many(chapter_docs[i : i + _FORK_BATCH_SIZE], ordered=False)
+
+    async def copy_notes() -> None:
+        now = datetime.utcnow()
+        batch: list[dict] = []
+        cursor = db.notes.find({"journey_id": journey_id}, {"content": 1, "title": 1, "chapter_id": 1})
+        async for note in cursor:
+            new_ch_id = old_to_new_chapter.get(str(note.get("chapter_id") or ""))
+            if not new_ch_id:
+                continue
+            batch.append(
                 {
                     "content": note.get("content") or "",
+                    "title": note.get("title"),
                     "chapter_id": new_ch_id,
                     "journey_id": new_jid,
+                    "created_at": now,
+                    "updated_at": now,
                 }
             )
+            if len(batch) >= _FORK_BATCH_SIZE:
+                await db.notes.insert_many(batch, ordered=False)
+                batch = []
+        if batch:
+            await db.notes.insert_many(batch, ordered=False)
 
+    if chapter_docs:
+        await asyncio.gather(copy_chapters(), copy_notes())
     return new_jid
@@ -0,0 +1,177 @@
+# app/services/kb_retrieval.py
+"""
+Knowledge retrieval for Knowledge-mode chat: Bedrock KB retrieve or the local vector index
+(RETRIEVAL_BACKEND), behind a TTL/LRU cache, with duplicate and near-duplicate chunks dropped
+and the packed excerpts capped by a token budget.
+"""
+
+import hashlib
+import logging
+import re
+
+from app.aws import get_client, run_blocking
+from app.config import settings
+from app.services.chat_cache import normalize_text
+from app.services.single_flight import SingleFlight
+from app.services.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w+")
+
+_cache: TTLCache | None = None
+_flight = SingleFlight("retrieval")
+_stats = {"hits": 0, "misses": 0, "chunks_retrieved": 0, "chunks_dropped": 0}
+
+
+def _get_cache() -> TTLCache:
+    global _cache  # noqa: PLW0603
+    if _cache is None:
+        _cache = TTLCache(settings.kb_cache_max_entries, settings.kb_cache_ttl_seconds)
+    return _cache
+
+
+def _use_local_index() -> bool:
+    return (settings.retrieval_backend or "").strip().lower() == "local"
+
+
+def knowledge_enabled() -> bool:
+    """True when Knowledge-mode chat has a retrieval backend to query."""
+    return _use_local_index() or bool((settings.knowledge_base_id or "").strip())
+
+
+def _retrieve_local(query: str, journey_id: str | None, chapter_id: str | None) -> list[str] | None:
+    try:
+        from app.services.local_index import get_local_index
+    except ImportError:
+        logger.warning("numpy not installed; local retrieval unavailable")
+        return None
+    hits = get_local_index().search(
+        query, settings.kb_number_of_results, journey_id=journey_id, chapter_id=chapter_id
+    )
+    return [rec["text"] for _, rec in hits]
+
+
+def retrieve_chunks(
+    query: str,
+    journey_id: str | None = None,
+    chapter_id: str | None = None,
+) -> list[str] | None:
+    """
+    Blocking retrieve from the configured backend; returns chunk texts in rank order.
+    Returns [] if no backend is configured, None if the call fails (so failures are not cached).
+    Journey/chapter filters apply to the local index only; Bedrock KB searches everything.
+    """
+    if _use_local_index():
+        return _retrieve_local(query, journey_id, chapter_id)
+    kbid = (settings.knowledge_base_id or "").strip()
+    if not kbid:
+        return []
+    try:
+        resp = get_client("bedrock-agent-runtime").retrieve(
+            knowledgeBaseId=kbid,
+            retrievalQuery={"text": query, "type": "TEXT"},
+            retrievalConfiguration={
+                "vectorSearchConfiguration": {"numberOfResults": settings.kb_number_of_results}
+            },
+        )
+    except Exception:
+        return None
+    parts = []
+    for item in resp.get("retrievalResults") or []:
+        content = item.get("content") or {}
+        # Text chunks: content may have 'text' or nested structure
+        text = content.get("text", "").strip() if isinstance(content.get("text"), str) else ""
+        if text:
+            parts.append(text)
+    return parts
+
+
+def _shingles(text: str, size: int = 3) -> set[tuple[str, ...]]:
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return {tuple(words)}
+    return {tuple(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+def dedupe_chunks(chunks: list[str], threshold: float) -> list[str]:
+    """
+    Drop exact duplicates (after normalization) and chunks whose word-trigram Jaccard
+    similarity to an already kept chunk is >= threshold. Keeps the first (highest-ranked) copy.
+    """
+    kept: list[str] = []
+    kept_shingles: list[set] = []
+    seen: set[str] = set()
+    for chunk in chunks:
+        digest = hashlib.sha1(normalize_text(chunk).encode("utf-8")).hexdigest()
+        if digest in seen:
+            continue
+        sh = _shingles(chunk)
+        if any(len(sh & other) / (len(sh | other) or 1) >= threshold for other in kept_shingles):
+            continue
+        seen.add(digest)
+        kept.append(chunk)
+        kept_shingles.append(sh)
+    return kept
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token), good enough for prompt budgeting."""
+    return (len(text) + 3) // 4
+
+
+def pack_chunks(chunks: list[str], max_tokens: int) -> str:
+    """Join chunks in rank order until the token budget is spent; the last one is cut at a word boundary."""
+    parts: list[str] = []
+    remaining = max_tokens
+    for chunk in chunks:
+        cost = estimate_tokens(chunk)
+        if cost <= remaining:
+            parts.append(chunk)
+            remaining -= cost
+            continue
+        if remaining >= 32:  # only worth including a partial chunk if it carries some content
+            cut = chunk[: remaining * 4]
+            space = cut.rfind(" ")
+            parts.append((cut[:space] if space > 0 else cut) + " ...")
+        break
+    return "\n\n".join(parts)
+
+
+async def retrieve_context(
+    query: str,
+    journey_id: str | None = None,
+    chapter_id: str | None = None,
+) -> str:
+    """
+    Knowledge-base excerpts for query, deduplicated and within KB_CONTEXT_MAX_TOKENS.
+    Cached per normalized query and filters; returns empty string if no backend or retrieve fails.
+    """
+    key = "\x1f".join([normalize_text(query), journey_id or "", chapter_id or ""])
+    cache = _get_cache()
+    cached = cache.get(key)
+    if cached is not None:
+        _stats["hits"] += 1
+        return cached
+    _stats["misses"] += 1
+    return await _flight.do(key, lambda: _fetch_context(key, query, journey_id, chapter_id))
+
+
+async def _fetch_context(key: str, query: str, journey_id: str | None, chapter_id: str | None) -> str:
+    chunks = await run_blocking(retrieve_chunks, query, journey_id, chapter_id)
+    if chunks is None:
+        return ""
+    unique = dedupe_chunks(chunks, settings.kb_near_duplicate_threshold)
+    _stats["chunks_retrieved"] += len(chunks)
+    _stats["chunks_dropped"] += len(chunks) - len(unique)
+    context = pack_chunks(unique, settings.kb_context_max_tokens)
+    _get_cache().set(key, context)
+    return context
+
+
+def retrieval_stats() -> dict:
+    return {**_stats, "size": len(_get_cache())}
+
+
+def retrieval_flight_stats() -> dict:
+    return _flight.stats()
@@ -1,6 +1,7 @@
 # app/services/knowledge_pipeline.py
 """
-Knowledge base pipeline: fetch YouTube transcript and upload to S3.
+Knowledge base pipeline: fetch YouTube transcript (once per video, via the transcript store) and
+write it to transcript storage (S3 or local directory; see transcript_storage).
 Runs in background so playlist/chapter creation is not blocked.
 """
 
@@ -9,9 +10,26 @@ import logging
 import re
 
 from app.config import settings
+from app.services.rate_limit import TokenBucket
+from app.services.transcript_storage import get_transcript_storage
+from app.services.transcript_chunks import save_chunks
+from app.services.transcript_store import (
+    content_hash,
+    get_transcript,
+    mark_chunked,
+    mark_stored,
+    save_transcript,
+    unpack_segments,
+)
 
 logger = logging.getLogger(__name__)
 
+# Shared by every transcript fetch in this process (background tasks, playlist imports, queue workers)
+_youtube_bucket = TokenBucket(
+    settings.youtube_transcript_rate_per_second,
+    settings.youtube_transcript_burst,
+)
+
 # YouTube URL patterns (watch and shorts)
 YT_WATCH_PATTERN = re.compile(
     r"(?:youtube\.com/watch\?v=|youtu\.be/)([a-zA-Z0-9_-]{11})"
@@ -28,11 +46,13 @@ def extract_video_id(video_link: str) -> str | None:
     return m.group(1) if m else None
 
 
-def fetch_transcript(video_id: str) -> str | None:
+def fetch_transcript_data(video_id: str) -> dict | None:
     """
     Fetch transcript for a YouTube video using youtube_transcript_api.
-    Uses instance API: api.fetch(video_id) -> iterable of entries with .text
-    Returns concatenated text or None if unavailable.
+    Uses instance API: api.fetch(video_id) -> iterable of entries with .text, .start, .duration
+    Returns {text, language, segments: [(start, duration, text)]} or None if unavailable.
+    text is the segment texts joined with single spaces (segment offsets rely on this).
+    Blocking; callers take a token from _youtube_bucket first (see process_video_transcript).
     """
     try:
         from youtube_transcript_api import YouTubeTranscriptApi
@@ -45,13 +65,39 @@ def fetch_transcript(video_id: str) -> str | None:
         transcript = api.fetch(video_id, languages=["en", "hi", "en-US", "en-GB"])
         if not transcript:
             return None
-        return " ".join(entry.text for entry in transcript).strip()
+        segments = [
+            (float(entry.start), float(entry.duration), " ".join(entry.text.split()))
+            for entry in transcript
+        ]
+        segments = [seg for seg in segments if seg[2]]
+        if not segments:
+            return None
+        return {
+            "text": " ".join(seg[2] for seg in segments),
+            "language": getattr(transcript, "language_code", None),
+            "segments": segments,
+        }
     except Exception as e:
         logger.warning("Transcript fetch failed for video %s: %s", video_id, type(e).__name__)
         return None
 
 
-def upload_transcript_to_s3(
+def store_transcript(video_id: str, text: str, *, content_hash: str) -> bool:
+    """
+    Write transcript text to the configured storage backend (S3 or local directory).
+    Skips the write when the stored object already carries the same content hash.
+    Returns True on success (or skip), False if no backend is configured or the write fails.
+    """
+    storage = get_transcript_storage()
+    if storage is None:
+        return False
+    if storage.has(video_id, content_hash):
+        logger.debug("Transcript %s unchanged in %s storage; skipping write", video_id, storage.name)
+        return True
+    return storage.put(video_id, text, content_hash)
+
+
+def index_transcript_locally(
     video_id: str,
     journey_id: str,
     text: str,
@@ -59,68 +105,81 @@ def upload_transcript_to_s3(
     chapter_id: str | None = None,
 ) -> bool:
     """
-    Upload transcript text to S3 as a text file.
-    Key: {s3_transcript_prefix}/{journey_id}/{video_id}[_{chapter_id}].txt
-    Returns True on success, False if S3 not configured or upload fails.
+    Add transcript chunks to the local vector index when RETRIEVAL_BACKEND=local,
+    so they are searchable immediately (no KB sync). Returns True if indexed.
     """
-    bucket = (settings.s3_bucket or "").strip()
-    if not bucket:
-        logger.debug("S3 bucket not configured; skipping transcript upload")
+    if (settings.retrieval_backend or "").strip().lower() != "local":
         return False
     try:
-        import boto3
-        from botocore.exceptions import ClientError
+        from app.services.local_index import get_local_index
     except ImportError:
-        logger.warning("boto3 not available; skipping S3 upload")
+        logger.warning("numpy not installed; skipping local indexing")
         return False
-
-    prefix = (settings.s3_transcript_prefix or "edutube/transcripts").strip().rstrip("/")
-    region = settings.s3_region or settings.aws_region
-    key = f"{prefix}/{journey_id}/{video_id}"
-    if chapter_id:
-        key = f"{key}_{chapter_id}"
-    key = f"{key}.txt"
-
-    kwargs = {"region_name": region}
-    if settings.aws_access_key_id and settings.aws_secret_access_key:
-        kwargs["aws_access_key_id"] = settings.aws_access_key_id
-        kwargs["aws_secret_access_key"] = settings.aws_secret_access_key
-
     try:
-        client = boto3.client("s3", **kwargs)
-        client.put_object(
-            Bucket=bucket,
-            Key=key,
-            Body=text.encode("utf-8"),
-            ContentType="text/plain; charset=utf-8",
-        )
-        logger.info("Uploaded transcript to s3://%s/%s", bucket, key)
+        n = get_local_index().add_transcript(video_id, journey_id, text, chapter_id=chapter_id)
+        logger.info("Indexed %d transcript chunks locally for video %s", n, video_id)
         return True
-    except ClientError as e:
-        logger.warning("S3 upload failed for %s: %s", key, e)
-        return False
     except Exception as e:
-        logger.warning("S3 upload error for %s: %s", key, e)
+        logger.warning("Local indexing failed for video %s: %s", video_id, e)
         return False
 
 
-def process_video_transcript(
+async def process_video_transcript(
     video_link: str,
     journey_id: str,
     chapter_id: str | None = None,
-) -> None:
+) -> bool:
     """
-    Sync worker: extract video ID, fetch transcript, upload to S3.
-    Safe to run in a thread; logs errors and does not raise.
+    Extract video ID, get the transcript (transcript store first, YouTube only on a miss),
+    build its timestamped chunks, write it to transcript storage unless the same content is
+    already there, and/or index locally.
+    Blocking steps run in threads; logs errors and does not raise.
+    Returns False when the work should be retried (fetch failed, or storage configured and write failed).
     """
     video_id = extract_video_id(video_link)
     if not video_id:
         logger.debug("Not a YouTube link, skipping transcript: %s", video_link[:80])
-        return
-    text = fetch_transcript(video_id)
-    if not text:
-        return
-    upload_transcript_to_s3(video_id, journey_id, text, chapter_id=chapter_id)
+        return True
+    try:
+        record = await get_transcript(video_id)
+    except Exception as e:
+        logger.warning("Transcript store lookup failed for %s: %s", video_id, e)
+        record = None
+    segments = None
+    if record is None:
+        # Wait for a YouTube token on the loop, not in the thread, so throttled fetches hold no executor thread
+        await _youtube_bucket.acquire()
+        fetched = await asyncio.to_thread(fetch_transcript_data, video_id)
+        if not fetched:
+            return False
+        text, segments = fetched["text"], fetched["segments"]
+        record = {"text": text, "sha256": content_hash(text)}
+        try:
+            record = await save_transcript(video_id, text, fetched["language"], segments)
+        except Exception as e:
+            logger.warning("Transcript store save failed for %s: %s", video_id, e)
+    text, sha = record["text"], record["sha256"]
+
+    if record.get("chunks_sha256") != sha:
+        segments = segments or unpack_segments(record)
+        if segments:
+            try:
+                count = await save_chunks(video_id, sha, segments)
+                await mark_chunked(video_id, sha, count)
+            except Exception as e:
+                logger.warning("Transcript chunking failed for %s: %s", video_id, e)
+
+    storage = get_transcript_storage()
+    stored = storage is not None and record.get("stored_sha256") == sha
+    if storage is not None and not stored:
+        stored = await asyncio.to_thread(store_transcript, video_id, text, content_hash=sha)
+        if stored:
+            try:
+                await mark_stored(video_id, sha, storage.key(video_id))
+            except Exception as e:
+                logger.warning("Transcript store update failed for %s: %s", video_id, e)
+    await asyncio.to_thread(index_transcript_locally, video_id, journey_id, text, chapter_id=chapter_id)
+    return stored or storage is None
 
 
 async def schedule_transcript_processing(
@@ -129,24 +188,37 @@ async def schedule_transcript_processing(
     chapter_id: str | None = None,
 ) -> None:
     """
-    Async wrapper for background task: runs sync transcript fetch + S3 upload
-    in a thread so the event loop is not blocked.
+    Background task entry point: processes one video and records the per-video result.
     """
-    await asyncio.to_thread(
-        process_video_transcript,
-        video_link,
-        journey_id,
-        chapter_id,
-    )
+    ok = await process_video_transcript(video_link, journey_id, chapter_id)
+    await _record_result(journey_id, video_link, chapter_id, ok)
+
+
+async def _record_result(journey_id: str, video_link: str, chapter_id: str | None, ok: bool) -> None:
+    from app.services.transcript_jobs import record_transcript_result
+
+    try:
+        await record_transcript_result(journey_id, video_link, chapter_id, ok)
+    except Exception as e:
+        logger.warning("Could not record transcript result for %s: %s", video_link[:80], e)
 
 
 async def schedule_playlist_transcripts(
-    video_links: list[str],
+    videos: list[tuple[str, str | None]],
     journey_id: str,
 ) -> None:
     """
-    Process multiple videos sequentially (playlist). Avoids thread-pool overload
-    and rate limits from firing many tasks at once.
+    Process playlist videos (video_link, chapter_id) with at most PLAYLIST_TRANSCRIPT_CONCURRENCY
+    in flight; a slow video only occupies its own slot. YouTube request rate is capped by the
+    shared token bucket in process_video_transcript.
     """
-    for link in video_links:
-        await schedule_transcript_processing(link, journey_id, chapter_id=None)
+    sem = asyncio.Semaphore(max(1, settings.playlist_transcript_concurrency))
+
+    async def run(link: str, chapter_id: str | None) -> None:
+        async with sem:
+            try:
+                await schedule_transcript_processing(link, journey_id, chapter_id=chapter_id)
+            except Exception as e:
+                logger.warning("Transcript processing failed for %s: %s", link[:80], e)
+
+    await asyncio.gather(*(run(link, cid) for link, cid in videos))
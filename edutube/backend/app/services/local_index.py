@@ -0,0 +1,248 @@
+# app/services/local_index.py
+"""
+Local in-process vector index over transcripts (offline RAG backend, no AWS).
+Transcripts are split into overlapping word chunks, embedded with a NumPy hashing vectorizer
+and appended to a float32 matrix on disk that is read back memory-mapped.
+
+Files under LOCAL_INDEX_DIR:
+  vectors.f32  raw row-major float32 matrix, LOCAL_INDEX_DIM columns
+  meta.jsonl   one record per row ({row, journey_id, chapter_id, video_id, text}) plus
+               {"op": "delete", "rows": [...]} records that tombstone rows when a transcript is re-indexed
+  index.lock   flock target serializing appends across processes
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import zlib
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def chunk_text(text: str, size: int = 200, overlap: int = 40) -> list[str]:
+    """Split text into chunks of `size` words, consecutive chunks sharing `overlap` words."""
+    words = text.split()
+    if not words:
+        return []
+    step = max(1, size - overlap)
+    chunks = []
+    for start in range(0, len(words), step):
+        chunks.append(" ".join(words[start : start + size]))
+        if start + size >= len(words):
+            break
+    return chunks
+
+
+def embed(texts: list[str], dim: int) -> np.ndarray:
+    """
+    Hashing vectorizer: unigrams and bigrams hashed (crc32) into `dim` signed buckets,
+    sublinear tf, L2-normalized rows. Deterministic, so queries and stored rows share a space.
+    """
+    out = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        tokens = _TOKEN.findall(text.lower())
+        feats = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        if not feats:
+            continue
+        hashes = np.fromiter((zlib.crc32(f.encode("utf-8")) for f in feats), dtype=np.uint32, count=len(feats))
+        idx = (hashes % dim).astype(np.int64)
+        sign = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+        np.add.at(out[row], idx, sign)
+    out = np.sign(out) * np.log1p(np.abs(out))
+    norms = np.linalg.norm(out, axis=1, keepdims=True)
+    np.divide(out, norms, out=out, where=norms > 0)
+    return out
+
+
+class LocalVectorIndex:
+    """
+    Append-only memory-mapped index shared by every process using the same directory (API workers and
+    `worker.py`). Appends hold an exclusive flock on index.lock; each meta record names its vector row,
+    so rows written by other processes never shift this process's mapping. Searches first read any meta
+    records appended since the last look (under a shared lock), so new transcripts are visible at once.
+    """
+
+    def __init__(self, directory: str, dim: int):
+        self.dim = dim
+        self.dir = directory
+        self._vec_path = os.path.join(directory, "vectors.f32")
+        self._meta_path = os.path.join(directory, "meta.jsonl")
+        self._lock_path = os.path.join(directory, "index.lock")
+        self._lock = threading.Lock()
+        self._meta: list[dict] = []
+        self._meta_offset = 0  # bytes of meta.jsonl already applied
+        self._by_row: dict[int, int] = {}  # vector row -> index into _meta
+        self._rows = np.zeros(0, dtype=np.int64)
+        self._alive = np.zeros(0, dtype=bool)
+        self._journeys = np.zeros(0, dtype=object)
+        self._chapters = np.zeros(0, dtype=object)
+        self._matrix: np.ndarray = np.zeros((0, dim), dtype=np.float32)
+        os.makedirs(directory, exist_ok=True)
+        with self._lock, self._file_lock(shared=True):
+            self._refresh()
+
+    @contextmanager
+    def _file_lock(self, shared: bool = False):
+        """Cross-process lock (fcntl); on platforms without it only one process may use the index."""
+        if fcntl is None:
+            yield
+            return
+        with open(self._lock_path, "a+b") as f:
+            fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _refresh(self) -> None:
+        """Apply meta records appended since the last refresh (caller holds both locks)."""
+        try:
+            size = os.path.getsize(self._meta_path)
+        except FileNotFoundError:
+            size = 0
+        if size <= self._meta_offset:
+            return
+        added: list[dict] = []
+        deleted: list[int] = []
+        with open(self._meta_path, "rb") as f:
+            f.seek(self._meta_offset)
+            for line in f:
+                rec = json.loads(line)
+                if rec.get("op") == "delete":
+                    deleted.extend(rec.get("rows") or [])
+                else:
+                    # Records written before rows were explicit are in row order
+                    rec.setdefault("row", len(self._meta) + len(added))
+                    added.append(rec)
+            self._meta_offset = f.tell()
+        base = len(self._meta)
+        for i, rec in enumerate(added):
+            self._by_row[rec["row"]] = base + i
+        self._meta.extend(added)
+        self._rows = np.concatenate([self._rows, np.array([r["row"] for r in added], dtype=np.int64)])
+        self._alive = np.concatenate([self._alive, np.ones(len(added), dtype=bool)])
+        self._journeys = np.concatenate([self._journeys, np.array([r.get("journey_id") for r in added], dtype=object)])
+        self._chapters = np.concatenate([self._chapters, np.array([r.get("chapter_id") for r in added], dtype=object)])
+        dead = [self._by_row[r] for r in deleted if r in self._by_row]
+        if dead:
+            self._alive[dead] = False
+        self._remap()
+
+    def _remap(self) -> None:
+        try:
+            n = os.path.getsize(self._vec_path) // (self.dim * 4)
+        except FileNotFoundError:
+            n = 0
+        if n == 0:
+            self._matrix = np.zeros((0, self.dim), dtype=np.float32)
+            return
+        self._matrix = np.memmap(self._vec_path, dtype=np.float32, mode="r", shape=(n, self.dim))
+
+    def add_transcript(
+        self,
+        video_id: str,
+        journey_id: str,
+        text: str,
+        *,
+        chapter_id: str | None = None,
+    ) -> int:
+        """Chunk, embed and append a transcript; replaces rows previously indexed for the same video/journey/chapter."""
+        chunks = chunk_text(text, settings.local_index_chunk_words, settings.local_index_chunk_overlap)
+        if not chunks:
+            return 0
+        vectors = embed(chunks, self.dim)
+        with self._lock, self._file_lock():
+            self._refresh()
+            stale = [
+                int(self._rows[i])
+                for i, r in enumerate(self._meta)
+                if self._alive[i]
+                and r.get("video_id") == video_id
+                and r.get("journey_id") == journey_id
+                and r.get("chapter_id") == chapter_id
+            ]
+            row_size = self.dim * 4
+            with open(self._vec_path, "ab") as f:
+                end = f.seek(0, os.SEEK_END)
+                first_row = -(-end // row_size)
+                if end % row_size:
+                    f.truncate(first_row * row_size)  # pad a row left partial by a writer that died mid-append
+                f.write(vectors.tobytes())
+            with open(self._meta_path, "a", encoding="utf-8") as f:
+                if stale:
+                    f.write(json.dumps({"op": "delete", "rows": stale}) + "\n")
+                for i, c in enumerate(chunks):
+                    rec = {
+                        "row": first_row + i,
+                        "journey_id": journey_id,
+                        "chapter_id": chapter_id,
+                        "video_id": video_id,
+                        "text": c,
+                    }
+                    f.write(json.dumps(rec) + "\n")
+            self._refresh()
+        return len(chunks)
+
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        *,
+        journey_id: str | None = None,
+        chapter_id: str | None = None,
+    ) -> list[tuple[float, dict]]:
+        """Top-k (score, record) by cosine similarity, optionally restricted to a journey and/or chapter."""
+        with self._lock:
+            if os.path.exists(self._meta_path) and os.path.getsize(self._meta_path) > self._meta_offset:
+                with self._file_lock(shared=True):
+                    self._refresh()
+            matrix, meta, rows = self._matrix, self._meta, self._rows
+            mask = self._alive.copy()
+            if journey_id is not None:
+                mask &= self._journeys == journey_id
+            if chapter_id is not None:
+                mask &= self._chapters == chapter_id
+        mask &= rows < len(matrix)
+        idx = np.flatnonzero(mask)
+        if idx.size == 0:
+            return []
+        q = embed([query], self.dim)[0]
+        scores = matrix[rows[idx]] @ q
+        k = min(k, idx.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(float(scores[i]), meta[idx[i]]) for i in top if scores[i] > 0]
+
+    def __len__(self) -> int:
+        return int(self._alive.sum())
+
+
+_index: LocalVectorIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_local_index() -> LocalVectorIndex:
+    """Process-wide index, loaded from LOCAL_INDEX_DIR on first use."""
+    global _index  # noqa: PLW0603
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                if fcntl is None:
+                    logger.warning("fcntl unavailable: the local index is only safe with a single writing process")
+                _index = LocalVectorIndex(settings.local_index_dir, settings.local_index_dim)
+                logger.info("Loaded local vector index with %d chunks", len(_index))
+    return _index
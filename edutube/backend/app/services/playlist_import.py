@@ -0,0 +1,146 @@
+# app/services/playlist_import.py
+"""
+Playlist import: insert chapters page by page and track asynchronous imports in the
+playlist_imports collection ({journey_id, playlist_id, state, pages, chapters_imported, truncated, error}).
+truncated is set when the playlist had more videos than PLAYLIST_MAX_VIDEOS.
+
+States: running -> done | failed. Async imports run in-process after the 202 response,
+so an import interrupted by a restart stays "running"; its journey keeps the chapters inserted so far.
+"""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from datetime import datetime
+
+from bson import ObjectId
+
+from app.database import get_db
+from app.services.chapter_service import create_chapters
+from app.services.playlist_service import iter_playlist_video_pages
+from app.services.transcript_jobs import dispatch_transcripts, get_journey_transcript_progress
+
+logger = logging.getLogger(__name__)
+
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+def _page_to_chapters(page: list[dict]) -> list[dict]:
+    return [
+        {
+            "title": v.get("title", ""),
+            "description": v.get("description", ""),
+            "video_link": v.get("videoLink", "no video"),
+            "external_link": "",
+            "chapter_no": v.get("chapterNo", 1),
+        }
+        for v in page
+    ]
+
+
+async def insert_playlist_pages(
+    journey_id: str,
+    pages: AsyncIterator[list[dict]],
+    on_page: Callable[[int], Awaitable[None]] | None = None,
+) -> list[tuple[str, str]]:
+    """
+    Insert each page of playlist videos as chapters (one insert_many per page), pipelined so page N
+    is written while page N+1 is fetched. Calls on_page(inserted_count) after each page.
+    Returns (video_link, chapter_id) pairs for transcript scheduling.
+    """
+    videos: list[tuple[str, str]] = []
+
+    async def insert_page(page: list[dict]) -> None:
+        chapters = _page_to_chapters(page)
+        ids = await create_chapters(journey_id, chapters)
+        videos.extend((ch["video_link"], cid) for ch, cid in zip(chapters, ids))
+        if on_page:
+            await on_page(len(ids))
+
+    pending: asyncio.Task | None = None
+    try:
+        async for page in pages:
+            if pending:
+                await pending
+            pending = asyncio.create_task(insert_page(page))
+        if pending:
+            await pending
+    finally:
+        if pending and not pending.done():
+            pending.cancel()
+    return videos
+
+
+async def start_playlist_import(journey_id: str, playlist_id: str, user_id: str) -> str:
+    """Record a running import for a journey; returns the import id."""
+    now = datetime.utcnow()
+    doc = {
+        "journey_id": journey_id,
+        "playlist_id": playlist_id,
+        "user_id": user_id,
+        "state": RUNNING,
+        "pages": 0,
+        "chapters_imported": 0,
+        "truncated": False,
+        "error": None,
+        "created_at": now,
+        "updated_at": now,
+    }
+    result = await get_db().playlist_imports.insert_one(doc)
+    return str(result.inserted_id)
+
+
+async def run_playlist_import(import_id: str, journey_id: str, playlist_id: str) -> None:
+    """Background body of an async import: insert all pages, then hand the videos to the transcript pipeline."""
+    db = get_db()
+    oid = ObjectId(import_id)
+
+    async def on_page(count: int) -> None:
+        await db.playlist_imports.update_one(
+            {"_id": oid},
+            {"$inc": {"pages": 1, "chapters_imported": count}, "$set": {"updated_at": datetime.utcnow()}},
+        )
+
+    async def on_truncated(limit: int) -> None:
+        await db.playlist_imports.update_one(
+            {"_id": oid},
+            {"$set": {"truncated": True, "updated_at": datetime.utcnow()}},
+        )
+
+    try:
+        pages = iter_playlist_video_pages(playlist_id, on_truncated)
+        videos = await insert_playlist_pages(journey_id, pages, on_page)
+    except Exception as e:
+        logger.exception("Playlist import %s failed", import_id)
+        await db.playlist_imports.update_one(
+            {"_id": oid},
+            {"$set": {"state": FAILED, "error": str(e) or type(e).__name__, "updated_at": datetime.utcnow()}},
+        )
+        return
+    await db.playlist_imports.update_one(
+        {"_id": oid},
+        {"$set": {"state": DONE, "updated_at": datetime.utcnow()}},
+    )
+    await dispatch_transcripts(journey_id, videos)
+
+
+async def get_import_status(journey_id: str) -> dict | None:
+    """Latest import for a journey with chapter and transcript counts, or None if it was not imported async."""
+    doc = await get_db().playlist_imports.find_one({"journey_id": journey_id}, sort=[("created_at", -1)])
+    if not doc:
+        return None
+    return {
+        "import_id": str(doc["_id"]),
+        "journey_id": journey_id,
+        "playlist_id": doc.get("playlist_id"),
+        "state": doc.get("state"),
+        "pages": doc.get("pages", 0),
+        "chapters_imported": doc.get("chapters_imported", 0),
+        "truncated": doc.get("truncated", False),
+        "error": doc.get("error"),
+        "transcripts": await get_journey_transcript_progress(journey_id),
+        "created_at": doc.get("created_at"),
+        "updated_at": doc.get("updated_at"),
+    }
@@ -1,11 +1,95 @@
 # app/services/playlist_service.py
-"""YouTube playlist fetch for journey-from-playlist feature."""
+"""
+YouTube playlist fetch for journey-from-playlist feature.
 
-import httpx
+Responses are cached in the youtube_cache collection. Fresh entries (YOUTUBE_CACHE_TTL_SECONDS) are
+served directly; stale ones are revalidated with If-None-Match so an unchanged resource costs a 304.
+With YOUTUBE_CACHE_STALE_WHILE_REVALIDATE the stale body is returned at once and revalidated in the
+background.
+"""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from datetime import datetime, timedelta
 
 from app.config import settings
+from app.database import get_db
+from app.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
 
 YT_KEY = settings.yt_key or ""
+YT_API = "https://www.googleapis.com/youtube/v3"
+
+# Background revalidations in flight, by cache key (also keeps task references alive)
+_revalidating: dict[str, asyncio.Task] = {}
+
+
+def _cache_key(endpoint: str, params: dict) -> str:
+    """Endpoint plus params, minus the API key, in a stable order."""
+    return endpoint + "?" + "&".join(f"{k}={params[k]}" for k in sorted(params) if k != "key")
+
+
+async def _store(key: str, update: dict, upsert: bool = False) -> None:
+    """Write a cache entry; failures are logged, never raised (the response is already in hand)."""
+    try:
+        await get_db().youtube_cache.update_one({"key": key}, {"$set": update}, upsert=upsert)
+    except Exception as e:
+        logger.warning("YouTube cache write failed for %s: %s", key, e)
+
+
+async def _fetch_and_store(endpoint: str, params: dict, key: str, cached: dict | None) -> dict:
+    headers = {"If-None-Match": cached["etag"]} if cached and cached.get("etag") else {}
+    r = await get_http_client().get(f"{YT_API}/{endpoint}", params=params, headers=headers)
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=settings.youtube_cache_max_stale_seconds)
+    if r.status_code == 304 and cached:
+        await _store(key, {"fetched_at": now, "expires_at": expires_at})
+        return cached["body"]
+    r.raise_for_status()
+    body = r.json()
+    entry = {
+        "etag": r.headers.get("etag") or body.get("etag"),
+        "body": body,
+        "fetched_at": now,
+        "expires_at": expires_at,
+    }
+    await _store(key, entry, upsert=True)
+    return body
+
+
+def _revalidate_in_background(endpoint: str, params: dict, key: str, cached: dict) -> None:
+    if key in _revalidating:
+        return
+
+    async def run() -> None:
+        try:
+            await _fetch_and_store(endpoint, params, key, cached)
+        except Exception as e:
+            logger.warning("YouTube cache revalidation failed for %s: %s", key, e)
+        finally:
+            _revalidating.pop(key, None)
+
+    _revalidating[key] = asyncio.create_task(run())
+
+
+async def _youtube_get(endpoint: str, params: dict) -> dict:
+    """GET a YouTube Data API resource through the ETag cache."""
+    key = _cache_key(endpoint, params)
+    try:
+        cached = await get_db().youtube_cache.find_one({"key": key})
+    except Exception as e:
+        logger.warning("YouTube cache lookup failed: %s", e)
+        cached = None
+    if cached:
+        age = (datetime.utcnow() - cached["fetched_at"]).total_seconds()
+        if age < settings.youtube_cache_ttl_seconds:
+            return cached["body"]
+        if settings.youtube_cache_stale_while_revalidate:
+            _revalidate_in_background(endpoint, params, key, cached)
+            return cached["body"]
+    return await _fetch_and_store(endpoint, params, key, cached)
 
 
 async def get_playlist_details(playlist_id: str) -> tuple[str, str]:
@@ -13,66 +97,82 @@ async def get_playlist_details(playlist_id: str) -> tuple[str, str]:
     if not YT_KEY or "demo" in YT_KEY:
         return f"Playlist {playlist_id}", f"Demo playlist description for {playlist_id}"
 
-    async with httpx.AsyncClient() as client:
-        r = await client.get(
-            "https://www.googleapis.com/youtube/v3/playlists",
-            params={"part": "snippet", "id": playlist_id, "key": YT_KEY},
-        )
-        r.raise_for_status()
-        data = r.json()
+    data = await _youtube_get("playlists", {"part": "snippet", "id": playlist_id, "key": YT_KEY})
     if not data.get("items"):
         raise ValueError("Playlist not found")
     snippet = data["items"][0]["snippet"]
     return snippet.get("title", ""), snippet.get("description", "")
 
 
-async def get_playlist_videos(playlist_id: str) -> list[dict]:
-    """Return list of {title, videoLink, description, chapterNo}. Uses mock if no API key."""
+MOCK_VIDEOS = [
+    {
+        "title": "Introduction to the Course",
+        "videoLink": "https://www.youtube.com/watch?v=Tn6-PIqc4UM",
+        "description": "First chapter introducing basic concepts.",
+        "chapterNo": 1,
+    },
+    {
+        "title": "Advanced Topics",
+        "videoLink": "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "description": "Deep dive into advanced topics.",
+        "chapterNo": 2,
+    },
+]
+
+
+def _item_to_video(item: dict, chapter_no: int) -> dict:
+    snippet = item.get("snippet", {})
+    desc = (snippet.get("description") or "")[:150]
+    if len((snippet.get("description") or "")) > 150:
+        last_space = desc.rfind(" ")
+        desc = (desc[: last_space] + "...") if last_space > 0 else desc + "..."
+    video_id = snippet.get("resourceId", {}).get("videoId", "")
+    return {
+        "title": snippet.get("title") or f"Chapter {chapter_no}",
+        "videoLink": f"https://www.youtube.com/watch?v={video_id}" if video_id else "no video",
+        "description": desc,
+        "chapterNo": chapter_no,
+    }
+
+
+async def iter_playlist_video_pages(
+    playlist_id: str,
+    on_truncated: Callable[[int], Awaitable[None]] | None = None,
+) -> AsyncIterator[list[dict]]:
+    """
+    Yield the playlist's videos page by page (up to 50 per page, following nextPageToken),
+    numbered continuously, stopping at PLAYLIST_MAX_VIDEOS. If videos remain past the cap it logs
+    a warning and awaits on_truncated(limit). Uses mock data if no API key.
+    """
     if not YT_KEY or "demo" in YT_KEY:
-        return [
-            {
-                "title": "Introduction to the Course",
-                "videoLink": "https://www.youtube.com/watch?v=Tn6-PIqc4UM",
-                "description": "First chapter introducing basic concepts.",
-                "chapterNo": 1,
-            },
-            {
-                "title": "Advanced Topics",
-                "videoLink": "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
-                "description": "Deep dive into advanced topics.",
-                "chapterNo": 2,
-            },
-        ]
-
-    async with httpx.AsyncClient() as client:
-        r = await client.get(
-            "https://www.googleapis.com/youtube/v3/playlistItems",
-            params={
-                "part": "snippet",
-                "playlistId": playlist_id,
-                "maxResults": 50,
-                "key": YT_KEY,
-            },
-        )
-        r.raise_for_status()
-        data = r.json()
-    if not data.get("items"):
-        raise ValueError("No videos found in playlist")
-
-    out = []
-    for i, item in enumerate(data["items"]):
-        snippet = item.get("snippet", {})
-        desc = (snippet.get("description") or "")[:150]
-        if len((snippet.get("description") or "")) > 150:
-            last_space = desc.rfind(" ")
-            desc = (desc[: last_space] + "...") if last_space > 0 else desc + "..."
-        video_id = snippet.get("resourceId", {}).get("videoId", "")
-        out.append(
-            {
-                "title": snippet.get("title") or f"Chapter {i + 1}",
-                "videoLink": f"https://www.youtube.com/watch?v={video_id}" if video_id else "no video",
-                "description": desc,
-                "chapterNo": i + 1,
-            }
-        )
-    return out
+        yield [dict(v) for v in MOCK_VIDEOS]
+        return
+
+    limit = settings.playlist_max_videos
+    count = 0
+    page_token: str | None = None
+    while count < limit:
+        params = {
+            "part": "snippet",
+            "playlistId": playlist_id,
+            "maxResults": min(50, limit - count),
+            # Only the fields we map, to keep pages small
+            "fields": "nextPageToken,items(snippet(title,description,resourceId/videoId))",
+            "key": YT_KEY,
+        }
+        if page_token:
+            params["pageToken"] = page_token
+        data = await _youtube_get("playlistItems", params)
+        items = data.get("items") or []
+        if not items and count == 0:
+            raise ValueError("No videos found in playlist")
+        page = [_item_to_video(item, count + i + 1) for i, item in enumerate(items)]
+        count += len(page)
+        if page:
+            yield page
+        page_token = data.get("nextPageToken")
+        if not page_token:
+            return
+    logger.warning("Playlist %s has more than PLAYLIST_MAX_VIDEOS=%d videos; import truncated", playlist_id, limit)
+    if on_truncated:
+        await on_truncated(limit)
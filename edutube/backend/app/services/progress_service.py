@@ -0,0 +1,230 @@
+# app/services/progress_service.py
+"""
+Per-learner chapter completion (progress collection), one document per (user_id, journey_id):
+
+  {user_id, journey_id, bits: {"<word>": <int64>}, updated_at}
+
+Each chapter owns a stable `position` slot in its journey (allocated from journeys.chapter_slots and
+never reused), and completion is bit `position` of the bitset: word position // 32, bit position % 32.
+Set/clear of any number of chapters is one atomic $bit update; reading a journey's progress is one
+document. Positions survive reordering (chapter_no is display order only). Deleting a chapter clears
+its bit for every learner, so a popcount is always the completed count.
+
+Journeys created before this existed carry is_completed flags on the chapter documents. Reads never
+write: until the owner records progress they see those flags as is. The first progress write backfills
+positions and seeds the flags into the owner's bitset.
+"""
+
+from datetime import datetime
+
+from bson import ObjectId
+from bson.int64 import Int64
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from app.database import get_db
+
+WORD_BITS = 32
+_WORD_MASK = (1 << WORD_BITS) - 1
+
+
+def _oid(s: str) -> ObjectId | None:
+    try:
+        return ObjectId(s)
+    except Exception:
+        return None
+
+
+def _word_masks(positions) -> dict[int, int]:
+    masks: dict[int, int] = {}
+    for p in positions:
+        masks[p // WORD_BITS] = masks.get(p // WORD_BITS, 0) | (1 << (p % WORD_BITS))
+    return masks
+
+
+def _to_int(bits: dict | None) -> int:
+    """Stored words -> one Python int bitset."""
+    value = 0
+    for word, mask in (bits or {}).items():
+        value |= (int(mask) & _WORD_MASK) << (int(word) * WORD_BITS)
+    return value
+
+
+def is_set(bitset: int, position: int | None) -> bool:
+    return position is not None and bool(bitset >> position & 1)
+
+
+async def _journey_owner(journey_id: str) -> str | None:
+    """user_id of the journey's owner, or None if the journey does not exist."""
+    oid = _oid(journey_id)
+    doc = await get_db().journeys.find_one({"_id": oid}, {"user_id": 1}) if oid else None
+    return (doc.get("user_id") or "") if doc else None
+
+
+async def allocate_positions(journey_id: str, count: int) -> range:
+    """Reserve `count` new chapter slots in a journey; empty if the journey does not exist."""
+    oid = _oid(journey_id)
+    if not oid or count <= 0:
+        return range(0)
+    doc = await get_db().journeys.find_one_and_update(
+        {"_id": oid},
+        {"$inc": {"chapter_slots": count}},
+        projection={"chapter_slots": 1},
+        return_document=ReturnDocument.AFTER,
+    )
+    if doc is None:
+        return range(0)
+    end = doc.get("chapter_slots", count)
+    return range(end - count, end)
+
+
+async def ensure_positions(journey_id: str, chapters: list[dict]) -> None:
+    """
+    Give chapters that predate positions a slot (in chapter_no order), in the database and in place.
+    A chapter positioned concurrently by another request keeps the stored slot, which is what it gets here.
+    Chapters stay unpositioned (None) if the journey is gone or the chapter was deleted meanwhile.
+    """
+    missing = [ch for ch in chapters if ch.get("position") is None]
+    if not missing:
+        return
+    missing.sort(key=lambda ch: ch.get("chapter_no") or 0)
+    slots = await allocate_positions(journey_id, len(missing))
+    oids = [ch.get("_id") or ObjectId(ch["id"]) for ch in missing]
+    ops = [
+        UpdateOne({"_id": oid, "position": None}, {"$set": {"position": pos}})
+        for oid, pos in zip(oids, slots)
+    ]
+    if not ops:
+        return
+    db = get_db()
+    r = await db.chapters.bulk_write(ops, ordered=False)
+    if r.modified_count == len(ops):
+        for ch, pos in zip(missing, slots):
+            ch["position"] = pos
+        return
+    # Some conditional updates lost the race: read back the positions actually stored
+    stored = {
+        doc["_id"]: doc.get("position")
+        async for doc in db.chapters.find({"_id": {"$in": oids}}, {"position": 1})
+    }
+    for ch, oid in zip(missing, oids):
+        ch["position"] = stored.get(oid)
+
+
+async def _apply_bits(user_id: str, journey_id: str, positions: list[int], completed: bool):
+    masks = _word_masks(positions)
+    op = "or" if completed else "and"
+    bit = {
+        f"bits.{w}": {op: Int64(m if completed else ~m & _WORD_MASK)}
+        for w, m in masks.items()
+    }
+    query = {"user_id": user_id, "journey_id": journey_id}
+    update = {"$bit": bit, "$set": {"updated_at": datetime.utcnow()}}
+    try:
+        return await get_db().progress.update_one(query, update, upsert=True)
+    except DuplicateKeyError:
+        # A concurrent first write inserted the document after our match; it exists now, so update it
+        return await get_db().progress.update_one(query, update, upsert=True)
+
+
+async def set_completed(
+    user_id: str,
+    journey_id: str,
+    positions: list[int | None],
+    completed: bool,
+) -> int:
+    """
+    Set or clear completion for many chapters of a journey in one atomic update. Chapters without a
+    position (deleted while being positioned) are skipped; returns how many were applied.
+    """
+    positions = [p for p in positions if p is not None]
+    if not positions:
+        return 0
+    r = await _apply_bits(user_id, journey_id, positions, completed)
+    if r.upserted_id is not None:
+        # First progress write for this learner: keep any legacy flags on the chapters they did not just change
+        await _seed_legacy(user_id, journey_id, exclude=set(positions))
+    return len(positions)
+
+
+async def clear_position(journey_id: str, position: int | None) -> None:
+    """A chapter was deleted: clear its bit for every learner of the journey."""
+    if position is None:
+        return
+    word, mask = position // WORD_BITS, 1 << (position % WORD_BITS)
+    await get_db().progress.update_many(
+        {"journey_id": journey_id, f"bits.{word}": {"$exists": True}},
+        {"$bit": {f"bits.{word}": {"and": Int64(~mask & _WORD_MASK)}}},
+    )
+
+
+async def get_bitset(user_id: str, journey_id: str) -> int | None:
+    """The learner's bitset for a journey, or None if they have never recorded progress on it."""
+    doc = await get_db().progress.find_one({"user_id": user_id, "journey_id": journey_id}, {"bits": 1})
+    return _to_int(doc.get("bits")) if doc else None
+
+
+async def get_bitsets(user_id: str, journey_ids: list[str]) -> dict[str, int]:
+    """Bitsets for many journeys in one query (journeys without progress are absent)."""
+    out: dict[str, int] = {}
+    cursor = get_db().progress.find(
+        {"user_id": user_id, "journey_id": {"$in": journey_ids}},
+        {"journey_id": 1, "bits": 1},
+    )
+    async for doc in cursor:
+        out[doc["journey_id"]] = _to_int(doc.get("bits"))
+    return out
+
+
+async def apply_completion(
+    user_id: str,
+    journey_id: str,
+    chapters: list[dict],
+    owner_id: str | None = None,
+) -> list[dict]:
+    """
+    Overwrite is_completed on chapter dicts (as returned by the chapter/journey services, with their
+    stored `position` and `is_completed`) with this learner's progress. Read-only. Without a progress
+    document the owner sees the legacy flags and anyone else sees nothing completed. Pass owner_id when
+    the caller already has the journey.
+    """
+    if not chapters:
+        return chapters
+    bitset = await get_bitset(user_id, journey_id)
+    if bitset is None:
+        owner = owner_id if owner_id is not None else await _journey_owner(journey_id)
+        for ch in chapters:
+            ch["is_completed"] = owner == user_id and bool(ch.get("is_completed"))
+        return chapters
+    for ch in chapters:
+        ch["is_completed"] = is_set(bitset, ch.get("position"))
+    return chapters
+
+
+async def get_completed_count(user_id: str, journey_id: str, owner_id: str | None = None) -> int:
+    """Completed chapters for a learner: a popcount, or the owner's legacy flags before any progress write."""
+    bitset = await get_bitset(user_id, journey_id)
+    if bitset is not None:
+        return bitset.bit_count()
+    owner = owner_id if owner_id is not None else await _journey_owner(journey_id)
+    if owner != user_id:
+        return 0
+    return await get_db().chapters.count_documents({"journey_id": journey_id, "is_completed": True})
+
+
+async def _seed_legacy(user_id: str, journey_id: str, exclude: set[int] = frozenset()) -> list[int]:
+    """Copy pre-progress is_completed chapter flags into the owner's bitset; returns the positions set."""
+    if await _journey_owner(journey_id) != user_id:
+        return []
+    db = get_db()
+    legacy = await db.chapters.find(
+        {"journey_id": journey_id, "is_completed": True},
+        {"position": 1, "chapter_no": 1},
+    ).to_list(None)
+    if not legacy:
+        return []
+    await ensure_positions(journey_id, legacy)
+    positions = [p for ch in legacy if (p := ch.get("position")) is not None and p not in exclude]
+    if positions:
+        await _apply_bits(user_id, journey_id, positions, True)
+    return positions
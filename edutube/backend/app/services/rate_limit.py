@@ -0,0 +1,40 @@
+# app/services/rate_limit.py
+"""Token-bucket rate limiter for async callers (e.g. before dispatching a transcript fetch to a thread)."""
+
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Refills `rate` tokens per second up to `burst`. `await acquire()` waits on the event loop until a
+    token is free, so throttled callers do not hold an executor thread while they wait.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        # Guards the counters only (never held across a wait); the bucket may be shared by several loops
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """Take one token, sleeping as needed; returns seconds waited."""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            await asyncio.sleep(delay)
+            waited += delay
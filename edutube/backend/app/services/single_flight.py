@@ -0,0 +1,51 @@
+# app/services/single_flight.py
+"""Single-flight request coalescing: concurrent calls with the same key share one in-flight upstream call."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+
+class SingleFlight:
+    """
+    The first caller for a key (the leader) starts the call as a task; callers arriving while it
+    runs await the same task. The task is shielded, so a disconnecting leader does not cancel
+    the call for everyone else. Keys are forgotten once the call finishes (no result caching).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._waiters: dict[str, int] = {}
+        self.calls = 0
+        self.merged = 0
+        self.max_waiters = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is not None:
+            self.merged += 1
+            self._waiters[key] += 1
+            self.max_waiters = max(self.max_waiters, self._waiters[key])
+        else:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda t, k=key: self._finish(k, t))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+            self._waiters.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # mark retrieved even if every caller went away
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "merged": self.merged,
+            "max_waiters": self.max_waiters,
+            "in_flight": len(self._inflight),
+        }
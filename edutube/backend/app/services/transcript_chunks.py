@@ -0,0 +1,148 @@
+# app/services/transcript_chunks.py
+"""
+Timestamped transcript chunks for chapter-scoped retrieval and seeking.
+
+Segments are (start, duration, text) triples as returned by the YouTube transcript API. They are
+streamed into fixed-size, overlapping time windows (TRANSCRIPT_CHUNK_SECONDS long, starting every
+TRANSCRIPT_CHUNK_SECONDS - TRANSCRIPT_CHUNK_OVERLAP_SECONDS) and stored one document per chunk in
+transcript_chunks, indexed by (video_id, start). Each chunk keeps per-segment start times and text
+offsets so overlapping chunks can be merged back without duplicating text.
+"""
+
+import math
+from collections import deque
+from collections.abc import Iterable, Iterator
+
+from app.config import settings
+from app.database import get_db
+
+Segment = tuple[float, float, str]
+
+_INSERT_BATCH = 500
+
+
+def _make_chunk(segs: list[Segment]) -> dict:
+    parts: list[str] = []
+    offsets: list[int] = []
+    pos = 0
+    for _, _, text in segs:
+        offsets.append(pos)
+        parts.append(text)
+        pos += len(text) + 1
+    last = segs[-1]
+    return {
+        "start": round(segs[0][0], 3),
+        "end": round(last[0] + last[1], 3),
+        "text": " ".join(parts),
+        "seg_starts": [round(s[0], 3) for s in segs],
+        "seg_offsets": offsets,
+    }
+
+
+def iter_time_chunks(segments: Iterable[Segment], size: float, overlap: float) -> Iterator[dict]:
+    """
+    Stream segments (sorted by start) into overlapping time windows; a segment belongs to every
+    window its start falls in. Empty windows (gaps in speech) are skipped, and no trailing chunk
+    is emitted that only repeats the previous chunk's overlap.
+    """
+    step = max(1.0, size - overlap)
+    window = 0.0
+    buf: deque[Segment] = deque()
+    for seg in segments:
+        while seg[0] >= window + size:
+            segs = [s for s in buf if s[0] < window + size]
+            if segs:
+                yield _make_chunk(segs)
+            window += step
+            while buf and buf[0][0] < window:
+                buf.popleft()
+            if not buf and seg[0] >= window + size:
+                window = step * math.floor(seg[0] / step)  # jump over a silent gap
+        buf.append(seg)
+    while buf:
+        segs = [s for s in buf if s[0] < window + size]
+        if segs:
+            yield _make_chunk(segs)
+        if len(segs) == len(buf):
+            break
+        window += step
+        while buf and buf[0][0] < window:
+            buf.popleft()
+
+
+async def save_chunks(video_id: str, content_hash: str, segments: Iterable[Segment]) -> int:
+    """Replace the stored chunks for video_id; returns the number of chunks written."""
+    coll = get_db().transcript_chunks
+    await coll.delete_many({"video_id": video_id})
+    batch: list[dict] = []
+    count = 0
+    chunks = iter_time_chunks(
+        segments,
+        settings.transcript_chunk_seconds,
+        settings.transcript_chunk_overlap_seconds,
+    )
+    for seq, chunk in enumerate(chunks):
+        batch.append({"video_id": video_id, "seq": seq, "sha256": content_hash, **chunk})
+        if len(batch) >= _INSERT_BATCH:
+            await coll.insert_many(batch, ordered=False)
+            count += len(batch)
+            batch = []
+    if batch:
+        await coll.insert_many(batch, ordered=False)
+        count += len(batch)
+    return count
+
+
+_CHUNK_PROJECTION = {"_id": 0, "start": 1, "end": 1, "text": 1, "seg_starts": 1, "seg_offsets": 1}
+
+
+async def get_video_chunks(video_id: str) -> list[dict]:
+    """All chunks for a video in start order (text and segment offsets, no ids)."""
+    cursor = get_db().transcript_chunks.find({"video_id": video_id}, _CHUNK_PROJECTION).sort("start", 1)
+    return [chunk async for chunk in cursor]
+
+
+def merge_window(chunks: list[dict], lo: float, hi: float) -> list[tuple[float, str]]:
+    """(start, text) of every segment starting in [lo, hi], deduplicated across overlapping chunks."""
+    seen: set[tuple[float, str]] = set()
+    segments: list[tuple[float, str]] = []
+    for chunk in chunks:
+        if chunk["end"] < lo or chunk["start"] > hi:
+            continue
+        text, starts, offsets = chunk["text"], chunk["seg_starts"], chunk["seg_offsets"]
+        for i, start in enumerate(starts):
+            if not (lo <= start <= hi):
+                continue
+            end = offsets[i + 1] - 1 if i + 1 < len(offsets) else len(text)
+            seg = (start, text[offsets[i] : end])
+            if seg not in seen:  # overlapping chunks repeat segments
+                seen.add(seg)
+                segments.append(seg)
+    segments.sort()
+    return segments
+
+
+async def get_transcript_window(video_id: str, t: float, before: float, after: float) -> dict | None:
+    """
+    Transcript text for [t - before, t + after] seconds, merged from the overlapping chunks.
+    Returns None if the video has no stored chunks.
+    """
+    lo, hi = max(0.0, t - before), t + after
+    cursor = get_db().transcript_chunks.find(
+        # start bounded on both sides keeps this an index range scan on (video_id, start)
+        {"video_id": video_id, "start": {"$gte": lo - settings.transcript_chunk_seconds, "$lte": hi}},
+        _CHUNK_PROJECTION,
+    ).sort("start", 1)
+    chunks = [chunk async for chunk in cursor]
+    if not chunks:
+        if await get_db().transcript_chunks.find_one({"video_id": video_id}, {"_id": 1}) is None:
+            return None
+    segments = merge_window(chunks, lo, hi)
+    return {
+        "video_id": video_id,
+        "t": t,
+        "start": segments[0][0] if segments else lo,
+        "end": hi,
+        "text": " ".join(s[1] for s in segments),
+        "segments": [{"start": s, "text": txt} for s, txt in segments],
+    }
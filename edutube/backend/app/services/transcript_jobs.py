@@ -0,0 +1,242 @@
+# app/services/transcript_jobs.py
+"""
+Durable transcript job queue in MongoDB (transcript_jobs collection) and the worker loop that drains it.
+
+Job states: queued -> running -> done | failed. A running job holds a lease that its worker renews
+while the job runs; if the worker dies the lease expires and another worker reclaims it. Failed attempts
+are retried with exponential backoff until TRANSCRIPT_JOB_MAX_ATTEMPTS. Workers run separately from
+the API: `python worker.py`.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timedelta
+
+from fastapi import BackgroundTasks
+from pymongo import ReturnDocument
+
+from app.config import settings
+from app.database import get_db
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+def queue_enabled() -> bool:
+    return (settings.transcript_jobs or "").strip().lower() == "queue"
+
+
+def _job_doc(video_link: str, journey_id: str, chapter_id: str | None, now: datetime) -> dict:
+    return {
+        "video_link": video_link,
+        "journey_id": journey_id,
+        "chapter_id": chapter_id,
+        "state": QUEUED,
+        "attempts": 0,
+        "max_attempts": settings.transcript_job_max_attempts,
+        "run_at": now,
+        "lease_until": None,
+        "worker": None,
+        "last_error": None,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+async def enqueue_transcript_jobs(
+    journey_id: str,
+    videos: list[tuple[str, str | None]],
+) -> list[str]:
+    """Insert one queued job per (video_link, chapter_id); returns job ids."""
+    if not videos:
+        return []
+    now = datetime.utcnow()
+    docs = [_job_doc(link, journey_id, cid, now) for link, cid in videos]
+    result = await get_db().transcript_jobs.insert_many(docs, ordered=False)
+    return [str(i) for i in result.inserted_ids]
+
+
+async def schedule_transcripts(
+    background_tasks: BackgroundTasks,
+    journey_id: str,
+    videos: list[tuple[str, str | None]],
+) -> None:
+    """
+    Route transcript work for (video_link, chapter_id) pairs: durable queue when TRANSCRIPT_JOBS=queue,
+    otherwise in-process background tasks (lost on restart, no retries). Queue jobs are inserted before
+    returning, so they are stored by the time the response is sent.
+    """
+    if queue_enabled():
+        await enqueue_transcript_jobs(journey_id, videos)
+        return
+    from app.services.knowledge_pipeline import (
+        schedule_playlist_transcripts,
+        schedule_transcript_processing,
+    )
+
+    if len(videos) == 1:
+        link, cid = videos[0]
+        background_tasks.add_task(schedule_transcript_processing, link, journey_id, chapter_id=cid)
+    elif videos:
+        background_tasks.add_task(schedule_playlist_transcripts, videos, journey_id)
+
+
+async def dispatch_transcripts(journey_id: str, videos: list[tuple[str, str | None]]) -> None:
+    """Like schedule_transcripts, for code already running outside a request: enqueue or process inline."""
+    if queue_enabled():
+        await enqueue_transcript_jobs(journey_id, videos)
+        return
+    from app.services.knowledge_pipeline import schedule_playlist_transcripts
+
+    if videos:
+        await schedule_playlist_transcripts(videos, journey_id)
+
+
+async def claim_job(worker_id: str) -> dict | None:
+    """Atomically take the oldest due job (or one whose lease expired) and lease it to worker_id."""
+    now = datetime.utcnow()
+    return await get_db().transcript_jobs.find_one_and_update(
+        {
+            "$or": [
+                {"state": QUEUED, "run_at": {"$lte": now}},
+                {"state": RUNNING, "lease_until": {"$lt": now}},
+            ]
+        },
+        {
+            "$set": {
+                "state": RUNNING,
+                "worker": worker_id,
+                "lease_until": now + timedelta(seconds=settings.transcript_job_lease_seconds),
+                "updated_at": now,
+            },
+            "$inc": {"attempts": 1},
+        },
+        sort=[("run_at", 1)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+async def renew_lease(job: dict) -> bool:
+    """Extend a running job's lease; False if another worker has reclaimed it."""
+    now = datetime.utcnow()
+    r = await get_db().transcript_jobs.update_one(
+        {"_id": job["_id"], "worker": job["worker"], "state": RUNNING},
+        {"$set": {"lease_until": now + timedelta(seconds=settings.transcript_job_lease_seconds), "updated_at": now}},
+    )
+    return r.matched_count > 0
+
+
+async def _heartbeat(job: dict) -> None:
+    """Renew the lease every third of its length while the job runs (cancelled when it finishes)."""
+    interval = max(1.0, settings.transcript_job_lease_seconds / 3)
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            if not await renew_lease(job):
+                logger.warning("Lost lease on transcript job %s", job["_id"])
+                return
+        except Exception as e:
+            logger.warning("Renewing lease on transcript job %s failed: %s", job["_id"], e)
+
+
+async def complete_job(job: dict) -> None:
+    now = datetime.utcnow()
+    await get_db().transcript_jobs.update_one(
+        {"_id": job["_id"], "worker": job["worker"]},
+        {"$set": {"state": DONE, "lease_until": None, "last_error": None, "updated_at": now}},
+    )
+
+
+async def fail_job(job: dict, error: str) -> None:
+    """Requeue with exponential backoff, or mark failed once attempts are exhausted."""
+    now = datetime.utcnow()
+    attempts = job.get("attempts", 1)
+    update: dict = {"lease_until": None, "last_error": error[:500], "updated_at": now}
+    if attempts >= job.get("max_attempts", settings.transcript_job_max_attempts):
+        update["state"] = FAILED
+    else:
+        delay = settings.transcript_job_backoff_seconds * 2 ** (attempts - 1)
+        update["state"] = QUEUED
+        update["run_at"] = now + timedelta(seconds=delay)
+    await get_db().transcript_jobs.update_one(
+        {"_id": job["_id"], "worker": job["worker"]},
+        {"$set": update},
+    )
+
+
+async def record_transcript_result(
+    journey_id: str,
+    video_link: str,
+    chapter_id: str | None,
+    ok: bool,
+) -> None:
+    """Record a video processed outside the queue (background mode) as a finished job, for progress reporting."""
+    now = datetime.utcnow()
+    doc = _job_doc(video_link, journey_id, chapter_id, now)
+    doc.update({"state": DONE if ok else FAILED, "attempts": 1, "worker": "background"})
+    if not ok:
+        doc["last_error"] = "transcript fetch or upload failed"
+    await get_db().transcript_jobs.update_one(
+        {"journey_id": journey_id, "video_link": video_link, "chapter_id": chapter_id, "worker": "background"},
+        {"$set": doc},
+        upsert=True,
+    )
+
+
+async def get_journey_transcript_progress(journey_id: str) -> dict:
+    """Counts of transcript jobs per state for a journey."""
+    counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+    pipeline = [
+        {"$match": {"journey_id": journey_id}},
+        {"$group": {"_id": "$state", "count": {"$sum": 1}}},
+    ]
+    async for row in get_db().transcript_jobs.aggregate(pipeline):
+        counts[row["_id"]] = row["count"]
+    return {"journey_id": journey_id, "total": sum(counts.values()), **counts}
+
+
+async def _run_job(job: dict) -> None:
+    from app.services.knowledge_pipeline import process_video_transcript
+
+    heartbeat = asyncio.create_task(_heartbeat(job))
+    try:
+        ok = await process_video_transcript(job["video_link"], job["journey_id"], job.get("chapter_id"))
+    except Exception as e:  # process_video_transcript logs and returns False; this is a safety net
+        ok, error = False, f"{type(e).__name__}: {e}"
+    else:
+        error = "" if ok else "transcript fetch or upload failed"
+    finally:
+        heartbeat.cancel()
+    if ok:
+        await complete_job(job)
+    else:
+        await fail_job(job, error)
+        logger.info("Transcript job %s attempt %s failed: %s", job["_id"], job.get("attempts"), error)
+
+
+async def _worker_loop(worker_id: str, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        try:
+            job = await claim_job(worker_id)
+        except Exception as e:
+            logger.warning("Claiming transcript job failed: %s", e)
+            job = None
+        if job is None:
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=settings.transcript_worker_poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            continue
+        await _run_job(job)
+
+
+async def run_worker(concurrency: int, stop: asyncio.Event) -> None:
+    """Run `concurrency` claim/execute loops until stop is set (each runs one job at a time)."""
+    base_id = f"{socket.gethostname()}:{os.getpid()}"
+    await asyncio.gather(*(_worker_loop(f"{base_id}:{i}", stop) for i in range(concurrency)))
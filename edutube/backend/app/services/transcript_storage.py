@@ -0,0 +1,181 @@
+# app/services/transcript_storage.py
+"""
+Pluggable transcript blob storage (TRANSCRIPT_STORAGE):
+  s3     one object per video under S3_TRANSCRIPT_PREFIX, shared client, optional compression,
+         managed multipart upload above S3_MULTIPART_THRESHOLD_MB
+  local  one file per video under TRANSCRIPT_LOCAL_DIR, atomic writes
+  none   nothing is stored (pipeline still caches text in the transcripts collection)
+
+Bodies are compressed with TRANSCRIPT_COMPRESSION (none | gzip | zstd). Keep "none" for S3 objects
+that a Bedrock Knowledge Base syncs from: KB ingestion expects plain text files.
+
+Storage is write-only from the API's side: the app reads transcripts from the transcripts collection
+(transcript_store / transcript_chunks); stored objects are for the KB sync and offline use.
+"""
+
+import gzip
+import io
+import logging
+import os
+import tempfile
+
+from app.aws import get_client
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_SUFFIX = {"none": ".txt", "gzip": ".txt.gz", "zstd": ".txt.zst"}
+
+
+def _codec() -> str:
+    codec = (settings.transcript_compression or "none").strip().lower()
+    if codec == "zstd":
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            logger.warning("zstandard not installed; falling back to gzip transcript compression")
+            return "gzip"
+    return codec if codec in _SUFFIX else "none"
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == "gzip":
+        return gzip.compress(data, compresslevel=6)
+    if codec == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return data
+
+
+class S3TranscriptStorage:
+    name = "s3"
+
+    def __init__(self, bucket: str, prefix: str, region: str, codec: str):
+        self.bucket = bucket
+        self.prefix = prefix.strip().rstrip("/")
+        self.region = region
+        self.codec = codec
+
+    def key(self, video_id: str) -> str:
+        """Content-addressed key: one object per video, shared by every journey that uses it."""
+        return f"{self.prefix}/videos/{video_id}{_SUFFIX[self.codec]}"
+
+    def _client(self):
+        return get_client("s3", self.region)
+
+    def has(self, video_id: str, content_hash: str) -> bool:
+        """True if the object exists and carries the same sha256 metadata."""
+        from botocore.exceptions import ClientError
+
+        try:
+            head = self._client().head_object(Bucket=self.bucket, Key=self.key(video_id))
+        except ClientError:
+            return False  # not there yet (404) or not readable
+        return (head.get("Metadata") or {}).get("sha256") == content_hash
+
+    def put(self, video_id: str, text: str, content_hash: str) -> bool:
+        key = self.key(video_id)
+        body = _compress(text.encode("utf-8"), self.codec)
+        extra = {
+            "ContentType": "text/plain; charset=utf-8",
+            "Metadata": {"sha256": content_hash},
+        }
+        if self.codec != "none":
+            extra["ContentEncoding"] = self.codec
+        try:
+            client = self._client()
+            threshold = settings.s3_multipart_threshold_mb * 1024 * 1024
+            if len(body) >= threshold:
+                from boto3.s3.transfer import TransferConfig
+
+                client.upload_fileobj(
+                    io.BytesIO(body),
+                    self.bucket,
+                    key,
+                    ExtraArgs=extra,
+                    Config=TransferConfig(multipart_threshold=threshold),
+                )
+            else:
+                client.put_object(Bucket=self.bucket, Key=key, Body=body, **extra)
+            logger.info("Uploaded transcript to s3://%s/%s (%d bytes)", self.bucket, key, len(body))
+            return True
+        except Exception as e:
+            logger.warning("S3 upload failed for %s: %s", key, e)
+            return False
+
+
+class LocalTranscriptStorage:
+    name = "local"
+
+    def __init__(self, directory: str, codec: str):
+        self.dir = directory
+        self.codec = codec
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, video_id: str) -> str:
+        return os.path.join(self.dir, f"{video_id}{_SUFFIX[self.codec]}")
+
+    def _hash_path(self, video_id: str) -> str:
+        return os.path.join(self.dir, f"{video_id}.sha256")
+
+    def has(self, video_id: str, content_hash: str) -> bool:
+        try:
+            with open(self._hash_path(video_id), encoding="ascii") as f:
+                return f.read().strip() == content_hash and os.path.exists(self.key(video_id))
+        except OSError:
+            return False
+
+    def _write_atomic(self, path: str, data: bytes) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.dir, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def put(self, video_id: str, text: str, content_hash: str) -> bool:
+        try:
+            self._write_atomic(self.key(video_id), _compress(text.encode("utf-8"), self.codec))
+            self._write_atomic(self._hash_path(video_id), content_hash.encode("ascii"))
+            return True
+        except OSError as e:
+            logger.warning("Local transcript write failed for %s: %s", video_id, e)
+            return False
+
+
+TranscriptStorage = S3TranscriptStorage | LocalTranscriptStorage
+
+_storage: TranscriptStorage | None = None
+_resolved = False
+
+
+def get_transcript_storage() -> TranscriptStorage | None:
+    """
+    Configured storage backend, or None. TRANSCRIPT_STORAGE defaults to s3 when S3_BUCKET is set
+    (the previous behaviour) and none otherwise.
+    """
+    global _storage, _resolved  # noqa: PLW0603
+    if _resolved:
+        return _storage
+    bucket = (settings.s3_bucket or "").strip()
+    backend = (settings.transcript_storage or ("s3" if bucket else "none")).strip().lower()
+    codec = _codec()
+    if backend == "s3" and bucket:
+        _storage = S3TranscriptStorage(
+            bucket,
+            settings.s3_transcript_prefix or "edutube/transcripts",
+            settings.s3_region or settings.aws_region,
+            codec,
+        )
+    elif backend == "local":
+        _storage = LocalTranscriptStorage(settings.transcript_local_dir, codec)
+    else:
+        if backend == "s3":
+            logger.debug("S3 bucket not configured; transcripts are not stored")
+        _storage = None
+    _resolved = True
+    return _storage
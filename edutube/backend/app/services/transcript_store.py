@@ -0,0 +1,109 @@
+# app/services/transcript_store.py
+"""
+Content-addressed transcript store: one record per YouTube video in the transcripts collection,
+holding the text plus metadata (language, length, fetch time, sha256) and the hash last written to
+transcript storage. Lets the pipeline skip the YouTube fetch and the storage write for videos it has seen.
+"""
+
+import hashlib
+import sys
+from array import array
+from datetime import datetime
+
+from bson import Binary
+
+from app.database import get_db
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _pack(typecode: str, values) -> Binary:
+    arr = array(typecode, values)
+    if sys.byteorder == "big":
+        arr.byteswap()  # stored little-endian
+    return Binary(arr.tobytes())
+
+
+def _unpack(typecode: str, data: bytes) -> array:
+    arr = array(typecode)
+    arr.frombytes(bytes(data))
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
+
+
+def pack_segments(segments: list[tuple[float, float, str]]) -> dict:
+    """
+    Compact segment timing for a transcript whose text is the segments joined with single spaces:
+    float32 start and duration arrays plus uint32 character offsets into the text.
+    """
+    offsets = []
+    pos = 0
+    for _, _, text in segments:
+        offsets.append(pos)
+        pos += len(text) + 1
+    return {
+        "start": _pack("f", (s[0] for s in segments)),
+        "duration": _pack("f", (s[1] for s in segments)),
+        "offset": _pack("I", offsets),
+    }
+
+
+def unpack_segments(record: dict) -> list[tuple[float, float, str]] | None:
+    """(start, duration, text) triples from a stored record, or None if it has no timing data."""
+    packed = record.get("segments")
+    if not packed:
+        return None
+    text = record["text"]
+    starts = _unpack("f", packed["start"])
+    durations = _unpack("f", packed["duration"])
+    offsets = _unpack("I", packed["offset"])
+    out = []
+    for i, off in enumerate(offsets):
+        end = offsets[i + 1] - 1 if i + 1 < len(offsets) else len(text)
+        out.append((float(starts[i]), float(durations[i]), text[off:end]))
+    return out
+
+
+async def get_transcript(video_id: str) -> dict | None:
+    """Stored transcript record for video_id, or None."""
+    return await get_db().transcripts.find_one({"video_id": video_id})
+
+
+async def save_transcript(
+    video_id: str,
+    text: str,
+    language: str | None,
+    segments: list[tuple[float, float, str]] | None = None,
+) -> dict:
+    """Upsert the transcript (and its segment timing, if given) for video_id; returns the stored record."""
+    record = {
+        "video_id": video_id,
+        "text": text,
+        "sha256": content_hash(text),
+        "language": language,
+        "length": len(text),
+        "fetched_at": datetime.utcnow(),
+    }
+    if segments:
+        record["segments"] = pack_segments(segments)
+    await get_db().transcripts.update_one({"video_id": video_id}, {"$set": record}, upsert=True)
+    return record
+
+
+async def mark_chunked(video_id: str, sha256: str, chunk_count: int) -> None:
+    """Remember which content hash transcript_chunks was built from."""
+    await get_db().transcripts.update_one(
+        {"video_id": video_id},
+        {"$set": {"chunks_sha256": sha256, "chunk_count": chunk_count}},
+    )
+
+
+async def mark_stored(video_id: str, sha256: str, storage_key: str) -> None:
+    """Remember which content hash is in transcript storage so later imports skip the write."""
+    await get_db().transcripts.update_one(
+        {"video_id": video_id},
+        {"$set": {"stored_sha256": sha256, "storage_key": storage_key, "stored_at": datetime.utcnow()}},
+    )
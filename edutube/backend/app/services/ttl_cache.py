@@ -0,0 +1,41 @@
+# app/services/ttl_cache.py
+"""Small in-process LRU cache with per-entry expiry, shared by the services that memoize lookups."""
+
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+class TTLCache:
+    """
+    Least-recently-used eviction above max_entries; entries expire ttl_seconds after they are set.
+    Not thread-safe: use it from the event loop only.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires, value = item
+        if expires < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
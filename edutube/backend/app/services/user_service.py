@@ -5,6 +5,7 @@ from bson import ObjectId
 
 from app.database import get_db
 from app.schemas import doc_to_user
+from app.services.catalog_service import rename_catalog_owner
 
 
 async def create_user(username: str, email: str, password_hash: str) -> str:
@@ -31,6 +32,18 @@ async def find_user_by_id(user_id: str) -> dict | None:
     return doc
 
 
+async def update_username(user_id: str, username: str) -> bool:
+    """Change a user's username and propagate it to their public catalog entries."""
+    try:
+        oid = ObjectId(user_id)
+    except Exception:
+        return False
+    r = await get_db().users.update_one({"_id": oid}, {"$set": {"username": username}})
+    if r.modified_count:
+        await rename_catalog_owner(user_id, username)
+    return r.matched_count > 0
+
+
 async def find_all_users() -> list[dict]:
     """Return all users as list of dicts with 'id' key."""
     cursor = get_db().users.find({})
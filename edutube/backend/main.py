@@ -1,20 +1,36 @@
 # main.py
 """EduTube API — FastAPI application for learning journeys, chapters, notes, and chatbot."""
 
+import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.aws import shutdown_aws
 from app.config import settings
 from app.database import connect_mongodb, close_mongodb
-from app.routers import users, journeys, chapters, notes, chatbot
+from app.http_client import open_http_client, close_http_client
+from app.routers import users, journeys, chapters, notes, chatbot, transcripts
+from app.services.catalog_service import ensure_catalog
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await connect_mongodb()
+    # Databases from before the materialized catalog have public journeys but no public_catalog yet.
+    # Best effort: a failed build must not keep the API from starting (rebuild_catalog.py can redo it).
+    try:
+        if (count := await ensure_catalog()) is not None:
+            logger.info("Built public catalog with %d journeys", count)
+    except Exception:
+        logger.exception("Public catalog build failed; run python rebuild_catalog.py")
+    await open_http_client()
     yield
+    await close_http_client()
+    shutdown_aws()
     await close_mongodb()
 
 
@@ -38,6 +54,7 @@ app.include_router(journeys.router, prefix="/api/v1")
 app.include_router(chapters.router, prefix="/api/v1")
 app.include_router(notes.router, prefix="/api/v1")
 app.include_router(chatbot.router, prefix="/api/v1")
+app.include_router(transcripts.router, prefix="/api/v1")
 
 
 @app.get("/")
@@ -0,0 +1,22 @@
+# rebuild_catalog.py
+"""Recompute the public_catalog collection from journeys, chapters and users. Run: python rebuild_catalog.py"""
+
+import asyncio
+import logging
+
+from app.database import connect_mongodb, close_mongodb
+from app.services.catalog_service import rebuild_catalog
+
+
+async def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    await connect_mongodb()
+    try:
+        count = await rebuild_catalog()
+        logging.info("Rebuilt public catalog with %d journeys", count)
+    finally:
+        await close_mongodb()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
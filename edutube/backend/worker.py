@@ -0,0 +1,31 @@
+# worker.py
+"""Transcript job worker: drains the transcript_jobs queue (TRANSCRIPT_JOBS=queue). Run: python worker.py"""
+
+import asyncio
+import logging
+import signal
+
+from app.config import settings
+from app.database import connect_mongodb, close_mongodb
+from app.services.transcript_jobs import run_worker
+
+
+async def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # Windows: Ctrl+C still raises KeyboardInterrupt
+            pass
+    await connect_mongodb()
+    try:
+        logging.info("Transcript worker started with %d slots", settings.transcript_worker_concurrency)
+        await run_worker(settings.transcript_worker_concurrency, stop)
+    finally:
+        await close_mongodb()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
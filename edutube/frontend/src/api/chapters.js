@@ -141,6 +141,28 @@ export const deleteChapter = async(chapterId) => {
       alert('Error updating chapter');
     }
   };
-  
-  
-  
\ No newline at end of file
+
+  export const reorderChapters = async(journeyId, chapterIds) => {
+    const token = getAuthToken();  // Get token at request time
+
+    try {
+      const response = await fetch(`${apiurl}/journeys/${journeyId}/chapters/order`, {
+        method: 'PUT',
+        headers: {
+          'Content-Type': 'application/json',
+          'Authorization': `Bearer ${token}`,
+        },
+        body: JSON.stringify({ chapter_ids: chapterIds }),
+      });
+
+      if (!response.ok) {
+        throw new Error('Failed to reorder chapters');
+      }
+
+      return await response.json();
+    } catch (error) {
+      console.error('Error reordering chapters:', error);
+      alert('Error reordering chapters');
+      throw error;  // Let the caller roll back its optimistic order
+    }
+  };
@@ -83,6 +83,56 @@ export const getAllJourneys = async () => {
   }
 };
 
+// Chapter totals and completed counts for every journey the user owns (one request)
+export const getJourneysProgress = async () => {
+  const token = getAuthToken();
+
+  try {
+    const response = await fetch(`${apiurl}/journeys/progress`, {
+      method: 'GET',
+      headers: {
+        'Authorization': `Bearer ${token}`,
+        'Content-Type': 'application/json'
+      },
+    });
+
+    if (!response.ok) {
+      throw new Error(`Failed to fetch progress: ${response.status} ${response.statusText}`);
+    }
+
+    return await response.json();
+  } catch (error) {
+    console.error('Error fetching progress:', error.message);
+  }
+};
+
+// Journey with chapters (and notes nested per chapter) in one request.
+// Options: { notes: false } skips notes; chapterFields / noteFields are comma-separated projections.
+export const getJourneyFull = async (journeyId, { notes = true, chapterFields, noteFields } = {}) => {
+  const token = getAuthToken();
+  const params = new URLSearchParams({ notes: String(notes) });
+  if (chapterFields) params.set('chapter_fields', chapterFields);
+  if (noteFields) params.set('note_fields', noteFields);
+
+  try {
+    const response = await fetch(`${apiurl}/journeys/${journeyId}/full?${params}`, {
+      method: 'GET',
+      headers: {
+        'Authorization': `Bearer ${token}`,
+        'Content-Type': 'application/json'
+      },
+    });
+
+    if (!response.ok) {
+      throw new Error(`Failed to fetch journey: ${response.status} ${response.statusText}`);
+    }
+
+    return await response.json();
+  } catch (error) {
+    console.error('Error fetching journey:', error.message);
+  }
+};
+
 // Get a specific journey by ID
 export const getJourneyById = async (journeyId) => {
   const token = getAuthToken();
@@ -153,10 +203,13 @@ export const deleteJourney = async (journeyId) => {
   }
 };
 
-export const fetchPublicJourneys = async () => {
+// Returns one page: { items, next_cursor }; pass next_cursor back as `cursor` for the next page
+export const fetchPublicJourneys = async ({ cursor, limit = 20, sort = 'recent' } = {}) => {
   const token = getAuthToken();
+  const params = new URLSearchParams({ limit: String(limit), sort });
+  if (cursor) params.set('cursor', cursor);
   try {
-    const response = await fetch(`${apiurl}/journeys/public`, {
+    const response = await fetch(`${apiurl}/journeys/public?${params}`, {
       method: 'GET',
       headers: {
         'Content-Type': 'application/json',
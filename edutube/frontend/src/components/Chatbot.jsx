@@ -1,5 +1,6 @@
 import React, { useState, useRef, useEffect } from 'react';
 import { MessageCircle, Send, X, RotateCcw, BookOpen } from 'lucide-react';
+import { getPlayerContext } from '../lib/playerSession';
 
 const Chatbot = () => {
   const [isOpen, setIsOpen] = useState(false);
@@ -52,8 +53,9 @@ const Chatbot = () => {
         },
         body: JSON.stringify({
           message: messageToSend,
-          context: "EduTube learning platform",
-          use_knowledge: useKnowledge
+          use_knowledge: useKnowledge,
+          // On the player page: chapter_id + playback timestamp ground the answer server-side
+          ...getPlayerContext()
         })
       });
 
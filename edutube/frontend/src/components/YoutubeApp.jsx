@@ -1,8 +1,9 @@
 import React from 'react';
 import YouTube from 'react-youtube';
 
-const YouTubeApp = ({ videoId }) => {
-  const useIframe = true;
+const YouTubeApp = ({ videoId, onPlayerReady }) => {
+  // The plain iframe cannot report playback time; callers that need the player get the API embed
+  const useIframe = !onPlayerReady;
 
   const opts = {
     height: '100%',
@@ -28,7 +29,13 @@ const YouTubeApp = ({ videoId }) => {
           </div>
         ) : (
           <div className="relative w-full overflow-hidden bg-black" style={{ aspectRatio: '16/9' }}>
-            <YouTube videoId={videoId} opts={opts} className="absolute inset-0 h-full w-full" />
+            <YouTube
+              videoId={videoId}
+              opts={opts}
+              className="absolute inset-0 h-full w-full"
+              iframeClassName="h-full w-full"
+              onReady={(e) => onPlayerReady?.(e.target)}
+            />
           </div>
         )
       ) : (
@@ -0,0 +1,26 @@
+/**
+ * The chapter currently open in the player page, shared with the global chatbot so questions
+ * are grounded on that chapter's transcript at the current playback position.
+ */
+let session = null;
+
+export function setPlayerSession(next) {
+  session = next;
+}
+
+export function clearPlayerSession(chapterId) {
+  if (session?.chapterId === chapterId) session = null;
+}
+
+/** { journey_id, chapter_id, timestamp } for the chat request, or {} outside the player page. */
+export function getPlayerContext() {
+  if (!session) return {};
+  const ctx = { journey_id: session.journeyId, chapter_id: session.chapterId };
+  try {
+    const t = session.player?.getCurrentTime?.();
+    if (typeof t === 'number' && t >= 0) ctx.timestamp = t;
+  } catch {
+    // Player not ready (or destroyed): send the chapter without a position
+  }
+  return ctx;
+}
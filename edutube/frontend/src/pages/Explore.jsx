@@ -15,18 +15,23 @@ import { AlertModal } from '../components/ui/alert-modal';
 
 const Explore = () => {
   const [journeys, setJourneys] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [searchQuery, setSearchQuery] = useState("");
   const [error, setError] = useState(null);
   const [user, setUser] = useState({});
   const [alertState, setAlertState] = useState({ open: false, title: '', message: '' });
 
-  const loadPublicJourneys = async () => {
+  const loadPublicJourneys = async (cursor = null) => {
+    setLoadingMore(true);
     try {
-      const data = await fetchPublicJourneys();
-      setJourneys(data);
-      console.log(journeys);
+      const data = await fetchPublicJourneys({ cursor });
+      setJourneys((prev) => (cursor ? [...prev, ...data.items] : data.items));
+      setNextCursor(data.next_cursor);
     } catch (error) {
       setError('Failed to load public journeys');
+    } finally {
+      setLoadingMore(false);
     }
   };
     const navigate = useNavigate()
@@ -174,6 +179,18 @@ const Explore = () => {
               </table>
             )}
           </div>
+          {!error && nextCursor && (
+            <div className="flex justify-center p-4 border-t border-border">
+              <button
+                type="button"
+                onClick={() => loadPublicJourneys(nextCursor)}
+                disabled={loadingMore}
+                className="text-sm font-medium text-primary hover:underline disabled:opacity-50"
+              >
+                {loadingMore ? 'Loading…' : 'Load more'}
+              </button>
+            </div>
+          )}
         </div>
       </div>
 
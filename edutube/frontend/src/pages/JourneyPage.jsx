@@ -5,10 +5,11 @@ import CreateChapter from "../Components/forms/CreateChapter";
 import AddNotes from "../Components/forms/AddNotes";
 import EditChapter from "../Components/forms/EditChapter";
 import VideoPlayer from "../Components/VideoPlayer";
-import { getJourneyById } from "../Api/journeys";
+import { getJourneyFull } from "../Api/journeys";
+import { ChevronDown, ChevronUp } from "lucide-react";
 import {
   deleteChapter,
-  getChaptersByJourneyId,
+  reorderChapters,
   updateChapterComplete,
 } from "../Api/chapters";
 import { RainbowButton } from "../components/ui/rainbow-button";
@@ -68,10 +69,27 @@ const JourneyPage = () => {
     }
   };
   
+  // Swap a chapter with its neighbour; the full id list is sent so every chapter_no is rewritten
+  const moveChapter = async (index, delta) => {
+    const target = index + delta;
+    if (target < 0 || target >= chapters.length) return;
+    const previous = chapters;
+    const reordered = [...chapters];
+    [reordered[index], reordered[target]] = [reordered[target], reordered[index]];
+    setChapters(reordered);
+    try {
+      await reorderChapters(jId, reordered.map((ch) => ch.id));
+      await fetchData();
+    } catch (error) {
+      setChapters(previous); // Server rejected the order: show the one it still has
+      console.error('Error reordering chapters:', error);
+    }
+  };
+
   const fetchData = async () => {
     try {
-      const journeys = await getJourneyById(jId);
-      const chapterList = await getChaptersByJourneyId(jId);
+      const journeys = await getJourneyFull(jId, { notes: false });
+      const chapterList = journeys?.chapters;
   
       if (journeys) {
         setJData(journeys);
@@ -242,6 +260,24 @@ const JourneyPage = () => {
                       </td>
                       <td className="px-4 py-3.5">
                         <div className="flex flex-wrap items-center justify-end gap-2">
+                          <button
+                            type="button"
+                            onClick={() => moveChapter(index, -1)}
+                            disabled={index === 0}
+                            aria-label="Move chapter up"
+                            className="inline-flex items-center rounded-lg border border-border bg-card p-1.5 text-foreground transition-all hover:bg-accent hover:text-accent-foreground disabled:opacity-40"
+                          >
+                            <ChevronUp className="h-4 w-4" />
+                          </button>
+                          <button
+                            type="button"
+                            onClick={() => moveChapter(index, 1)}
+                            disabled={index === chapters.length - 1}
+                            aria-label="Move chapter down"
+                            className="inline-flex items-center rounded-lg border border-border bg-card p-1.5 text-foreground transition-all hover:bg-accent hover:text-accent-foreground disabled:opacity-40"
+                          >
+                            <ChevronDown className="h-4 w-4" />
+                          </button>
                           <Link
                             to={`/notes/${jId}?chapterId=${chapter.id}`}
                             className="inline-flex items-center rounded-lg border border-border bg-card px-3 py-1.5 text-sm font-medium text-foreground transition-all hover:bg-accent hover:text-accent-foreground"
@@ -1,7 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import { Link, useParams, useSearchParams } from 'react-router-dom';
-import { getNotesByJourney, getNotesByChapter } from '../api/notes';
-import { getJourneyById } from '../api/journeys';
+import { getNotesByChapter } from '../api/notes';
+import { getJourneyById, getJourneyFull } from '../api/journeys';
 import { getChaptersByJourneyId } from '../api/chapters';
 import { AlertModal } from '../components/ui/alert-modal';
 import jsPDF from 'jspdf';
@@ -50,10 +50,9 @@ const Notes = () => {
     if (!journeyId) return;
     setError(null);
     try {
-      const fetchJourney = await getJourneyById(journeyId);
-      setJData(fetchJourney || {});
-
       if (chapterId) {
+        const fetchJourney = await getJourneyById(journeyId);
+        setJData(fetchJourney || {});
         // Per-chapter: only this video's notes (others not visible)
         const chapterNotes = await getNotesByChapter(chapterId);
         setNotes(Array.isArray(chapterNotes) ? chapterNotes : []);
@@ -61,9 +60,10 @@ const Notes = () => {
         const ch = (chapters || []).find((c) => c.id === chapterId);
         setChapterTitle(ch?.title || null);
       } else {
-        // Playlist-level: all notes for this playlist (all PDFs)
-        const journeyNotes = await getNotesByJourney(journeyId);
-        setNotes(Array.isArray(journeyNotes) ? journeyNotes : []);
+        // Playlist-level: all notes for this playlist (all PDFs), journey and notes in one request
+        const full = await getJourneyFull(journeyId, { chapterFields: 'chapter_no' });
+        setJData(full || {});
+        setNotes((full?.chapters || []).flatMap((ch) => ch.notes || []));
         setChapterTitle(null);
       }
     } catch (err) {
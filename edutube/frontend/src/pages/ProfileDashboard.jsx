@@ -1,10 +1,8 @@
 import React, { useEffect, useState } from "react";
 import { Link } from "react-router-dom";
 import JourneyPieChart from "../Components/Dashboard/JourneyPieChart";
-import { calculateProgress } from "../Constants";
 import { getUserProfile } from "../Api";
-import { getAllJourneys } from "../Api/journeys";
-import { getChaptersByJourneyId } from "../Api/chapters";
+import { getJourneysProgress } from "../Api/journeys";
 
 const ProfileDashboard = () => {
   const [user, setUser] = useState(null);
@@ -13,21 +11,15 @@ const ProfileDashboard = () => {
 
   const fetchJourneys = async () => {
     try {
-      const journeyList = await getAllJourneys();
-      const withProgress = await Promise.all(
-        journeyList.map(async (journey) => {
-          const chapters = await getChaptersByJourneyId(journey.id);
-          const pct = calculateProgress(chapters);
-          const progress = typeof pct === "string" ? parseInt(pct, 10) : pct;
-          return {
-            id: journey.id,
-            name: journey.title,
-            completed: progress,
-            remaining: Math.max(0, 100 - progress),
-          };
-        })
+      const progressList = (await getJourneysProgress()) || [];
+      setJourneys(
+        progressList.map((p) => ({
+          id: p.journey_id,
+          name: p.title,
+          completed: p.percent,
+          remaining: Math.max(0, 100 - p.percent),
+        }))
       );
-      setJourneys(withProgress);
     } catch (error) {
       console.error("Error fetching journeys:", error);
     } finally {
@@ -1,14 +1,16 @@
-import React, { useEffect, useState } from "react";
+import React, { useCallback, useEffect, useRef, useState } from "react";
 import YouTubeApp from "../Components/YoutubeApp.jsx";
 import AddNotes from "../Components/forms/AddNotes";
 import { useParams } from "react-router-dom";
 import { getChaptersById } from "../Api/chapters.js";
 import { extractVideoId } from "../Constants/index.js";
+import { setPlayerSession, clearPlayerSession } from "../lib/playerSession.js";
 
 const VideoPlayerPage = () => {
   const { chapterId } = useParams(); // Get chapter ID from URL params
   const [videoId, setVideoId] = useState("");
   const [chapter, setChapter] = useState(null); // Initialize as null to check loading state
+  const playerRef = useRef(null);
 
   // Function to fetch chapter data
   const fetchChapter = async () => {
@@ -28,6 +30,20 @@ const VideoPlayerPage = () => {
     fetchChapter(); // Fetch chapter when component mounts or chapterId changes
   }, [chapterId]);
 
+  // Let the chatbot ground questions on this chapter and the current playback time
+  useEffect(() => {
+    if (!chapter) return undefined;
+    setPlayerSession({ chapterId: chapter.id, journeyId: chapter.journey_id, player: playerRef.current });
+    return () => clearPlayerSession(chapter.id);
+  }, [chapter]);
+
+  const handlePlayerReady = useCallback((player) => {
+    playerRef.current = player;
+    if (chapter) {
+      setPlayerSession({ chapterId: chapter.id, journeyId: chapter.journey_id, player });
+    }
+  }, [chapter]);
+
   // Return loading state while waiting for data
   if (!chapter) {
     return <div className="text-foreground">Loading...</div>;
@@ -66,7 +82,7 @@ const VideoPlayerPage = () => {
         <div className="flex flex-col gap-8 lg:flex-row lg:gap-10">
           <div className="min-w-0 flex-[6] lg:min-w-[60%]">
             <div className="overflow-hidden rounded-xl border border-border bg-card shadow-sm">
-              <YouTubeApp videoId={videoId} />
+              <YouTubeApp videoId={videoId} onPlayerReady={handlePlayerReady} />
             </div>
           </div>
           <aside className="min-w-0 flex-[4] lg:min-w-[40%]">